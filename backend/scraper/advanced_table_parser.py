@@ -4,19 +4,439 @@ Advanced Pandas-based Table Parser for Timetable Data
 This replaces the fragile line-by-line parsing with proper table extraction
 """
 import pandas as pd
+import numpy as np
 import re
 import logging
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import io
+from functools import lru_cache
 from difflib import SequenceMatcher
 
+from .utils import cached_parse
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # optional C++ speedup - difflib gives a comparable 0-1 ratio
+    fuzz = None
+
 logger = logging.getLogger(__name__)
 
+# Patterns used by _parse_schedule_line, compiled once at import instead of per entry
+_SR_NO_RE = re.compile(r'^(\d+)\s+')
+_DEPT_RE = re.compile(r'^\d+\s+([A-Z/\s]+?)\s+(?:BS|MS|PhD|EMBA|PMBA|MBA|BBA|MHRM|MPM|MMS)')
+_TITLE_CREDITS_RE = re.compile(r'\s*\([0-9,]+\)\s*$')
+_TITLE_TRAILING_RE = re.compile(r'[-/\s]+$')
+# "/" is already in [^()], so a plain run of non-paren chars captures every segment;
+# the old nested (?:/[^()]+)* repeat only added backtracking paths
+_TITLE_EXTENDED_RE = re.compile(r'^([^()]+)')
+_CAMPUS_RE = re.compile(r'(SZABIST[^$]+)$')
+_WS_RE = re.compile(r'\s+')
+_DIGIT_RE = re.compile(r'\d')
+_CANCELLED_RE = re.compile(r'cancelled', re.IGNORECASE)
+
+# Semester patterns, tried in order - handles ALL section formats
+_SEMESTER_PATTERNS = tuple(re.compile(p) for p in (
+    # Complex multi-section patterns like "EMBA - 1 / PMBA - 1 / MBA (72) Day / Eve - 1"
+    r'((?:EMBA|PMBA|MBA)\s*-\s*\d+(?:\s*/\s*(?:EMBA|PMBA|MBA)(?:\s*\(\d+\))?\s*(?:Day|Eve)?\s*-\s*\d+)*)',
+    # MS patterns with complex aliases like "MS (SS) - 1 / MSS - 1"
+    r'(MS\s*\([A-Z]{2,4}\)\s*-\s*[0-9A-Z]+(?:\s*/\s*[A-Z]{2,4}\s*-\s*[0-9A-Z]+)*)',
+    # BS patterns like "BS (CS) / BSSE Open", "BS(CS) - 8B"
+    r'(BS\s*\(?[A-Z]{2,4}\)?\s*(?:/\s*[A-Z]{2,4})?\s*(?:-\s*[0-9A-Z]+|Open))',
+    # Simple patterns like "BBA - 2", "MMS Zero", "MMS - 1"
+    r'((?:BBA|MMS|MHRM|MPM)\s*(?:-\s*\d+|Zero))',
+    # AI patterns like "BSAI - 1B", "BSAI - 4A"
+    r'(BSAI\s*-\s*[0-9A-Z]+)',
+    # SE patterns like "BS (SE) - 4A"
+    r'(BS\s*\([A-Z]{2}\)\s*-\s*[0-9A-Z]+)',
+    # SS patterns like "BS (SS) - 5"
+    r'(BS\s*\([A-Z]{2}\)\s*-\s*\d+)',
+    # PM patterns with additional qualifiers like "MS (PM) - 1 A Core", "MS (PM) - 2 A & 3 A Elective"
+    r'(MS\s*\([A-Z]{2}\)\s*-\s*[0-9A-Z]+\s*[A-Z]*(?:\s*(?:Core|Elective|&\s*\d+\s*[A-Z]*\s*Elective))?)',
+    # Generic fallback for any pattern
+    r'([A-Z]{2,4}\s*(?:\([A-Z]{2,4}\))?\s*-\s*[0-9A-Z]+(?:\s*[A-Z]+)?)',
+))
+
+# Course code patterns - ALL course code formats INCLUDING DASHES
+_COURSE_PATTERNS = tuple(re.compile(p) for p in (
+    r'\b([A-Z]{2,4}L?\s*TE\d{2})\b',          # Special codes like "HR TE11", "PM TE03"
+    r'\b([A-Z]{2,4}L?\s*-?\s*\d{2,4})\b',     # Standard codes with optional dash: "BE-5105", "CSC 3202", "BE 5101"
+    r'\b([A-Z]{2,3}\s*-?\s*\d{2,4})\b',       # Short codes with optional dash: "MD-2323", "MD 2323"
+))
+
+# Course title patterns: everything until faculty name or time
+_TITLE_PATTERNS = tuple(re.compile(p) for p in (
+    # Pattern 1: Title with credits in parentheses before faculty
+    r'^([^()]+(?:\([0-9,]+\))?)\s+(?:Dr\.|Prof\.|Mr\.|Ms\.|[A-Z][a-z]+\s+[A-Z][a-z]+)',
+    # Pattern 2: Title until faculty name (multiple words starting with capital)
+    r'^([^()]+?)\s+(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
+    # Pattern 3: Title until room/time
+    r'^([^()]+?)\s+(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
+    # Pattern 4: Title with multiple "/" segments - capture ALL
+    # (single [^()]+ run instead of a nested "/" repeat, which backtracked exponentially on misses)
+    r'^([^()]+)(?:\s*\([0-9,]+\))?\s+(?:Dr\.|Prof\.|[A-Z][a-z]+)',
+    # Pattern 5: Everything until first proper name or room
+    r'^([^()]+?)(?:\s+(?:[A-Z][a-z]+\s+[A-Z][a-z]+|Dr\.|Prof\.)|\s+\d{3}|\s+Hall|\s+Lab)',
+))
+
+# Faculty name patterns - ALL name formats, each paired with a literal the pattern cannot
+# match without (None = no cheap precondition), so a substring test can skip the regex scan
+_FACULTY_PATTERNS = tuple((literal, re.compile(p)) for literal, p in (
+    # Pattern 1: "Dr. Faculty Name" (with title)
+    ('Dr.', r'\b(Dr\.\s+[A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z-]+)*)\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2}|Cancelled)'),
+    # Pattern 2: Faculty name before room/time (no title) - at least 2 words, handle mixed case
+    (None, r'\b([A-Z][a-z]+\s+[A-Za-z][a-z]*(?:\s+[A-Z][a-z]+)*)\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})'),
+    # Pattern 3: Faculty name before "Cancelled"
+    ('Cancelled', r'\b([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)*)\s+Cancelled'),
+    # Pattern 4: After credits pattern
+    ('(', r'\([0-9,]+\)\s+([A-Z][A-Za-z\s]+?)\s+(?:-\s+)?(?:\d{3}|Hall|NB-|Lab|\d{1,2}:\d{2})'),
+    # Pattern 5: Single name patterns (for cases where only last name is given)
+    (None, r'\b([A-Z][a-z]{3,})\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})'),
+))
+
+# Faculty before "Cancelled", including full names like "Dr. Muhammad Abo-Ul-Hassan Rashid"
+_CANCELLED_FACULTY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(Dr\.\s+[A-Za-z\-\s\.]+?)\s+Cancelled',  # Dr. Full Name Cancelled
+    r'(Prof\.\s+[A-Za-z\-\s\.]+?)\s+Cancelled',  # Prof. Full Name Cancelled
+    r'([A-Z][a-z]+(?:\s+[A-Za-z\-]+)*)\s+Cancelled',  # Name Cancelled (no title)
+))
+
+_TIME_PATTERNS = tuple(re.compile(p) for p in (
+    # Standard format: "08:00 AM - 09:30 AM"
+    r'(\d{1,2}:\d{2}\s*[AP]M\s*(?:-|–|—)\s*\d{1,2}:\d{2}\s*[AP]M)',
+    # Single time: "08:00 AM"
+    r'(\d{1,2}:\d{2}\s*[AP]M)',
+))
+
+_ROOM_PATTERNS = tuple((literal, re.compile(p)) for literal, p in (
+    ('TV', r'\b(TV\s+Studio)\b'),             # "TV Studio"
+    ('Media', r'\b(Media\s+Lab)\b'),          # "Media Lab"
+    ('Digital', r'\b(Digital\s+Lab)\b'),      # "Digital Lab"
+    ('Hall', r'\b(Hall\s+\d+\s*[A-Z]?)\b'),    # "Hall 01 A"
+    ('NB-', r'\b(NB-\d+)\b'),                 # "NB-206"
+    ('Lab', r'\b(Lab\s+\d+)\b'),              # "Lab 02"
+    (':', r'\b(\d{3})\s+\d{1,2}:\d{2}'),       # "305" before time
+    (None, r'\s(\d{3})\s'),                  # "305" with spaces
+))
+
+# Common non-faculty words that faculty patterns pick up by mistake
+_FACULTY_EXCLUDE_WORDS = ('Hall', 'Lab', 'Room', 'AM', 'PM', 'SZABIST', 'University', 'Campus',
+                          'Design', 'Analysis', 'Data', 'Computer', 'Assessment', 'Techniques',
+                          'Management', 'Development', 'Research', 'International', 'Strategic',
+                          'Marketing', 'Accounting', 'Business', 'Applied', 'Introduction',
+                          'Fundamentals', 'Advanced', 'Principles', 'Ethics', 'Corporate')
+# Substring test for all of them in a single scan, instead of one `in` check per word
+_FACULTY_EXCLUDE_RE = re.compile('|'.join(map(re.escape, _FACULTY_EXCLUDE_WORDS)))
+
+# Patterns used by the AdvancedTableParser semester matching and cleanup steps
+_SEMESTER_PROGRAM_PAREN_RE = re.compile(r'\b(BS|MS|PhD)\s+\(')
+_PARENS_RUN_RE = re.compile(r'[\(\)]+')
+_TRAILING_FACULTY_RE = re.compile(r'\s+(Dr\.?|Prof\.?|Mr\.?|Ms\.?|Miss)\.?(?:\s+[A-Za-z\s\.]+)?$', re.IGNORECASE)
+_ADDITIONAL_COURSE_RE = re.compile(r'\s*/\s*[A-Z]{2,4}\s*\d{4}.*')
+_TRAILING_SLASH_RE = re.compile(r'\s*/\s*$')
+_TIME_RANGE_RE = re.compile(r'(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})')
+_ROOM_NUMBER_RE = re.compile(r'\d{3}')  # used with fullmatch
+# Patterns used by _extract_tables_from_text to reconstruct multi-line Gmail entries
+_ENTRY_START_RE = re.compile(r'^\d+\s+[A-Z]{2,4}\s+')
+_SEPARATOR_PREFIXES = ('🕗', '🔸')  # emoji headers, checked with str.startswith
+_DATE_LINE_RE = re.compile(r'^\d{1,2}-\d{1,2}-\d{4}')
+# Lines with faculty names, times, rooms, etc. - enhanced patterns for better continuation detection
+_CONTINUATION_RE = re.compile(
+    r'Dr\.|Prof\.|Mr\.|Ms\.|\d{1,2}:\d{2}\s*[AP]M|Hall|Lab|NB-|\d{3}|SZABIST|Campus|Cancelled|Accounting|Management|Ethics|Governance|Marketing|Analysis|Development|Research|International|Engineering|Programming|Computing|Vision|Technical|Business|Communication|Project|Risk|Organizational|Strategic|Supply|Chain|Operations|Fundamentals|Applied|Principles|Assessment|Diagnosis|Quantitative|Qualitative|Psychotherapy|Counseling|Media|Journalism|Participation|Community|Resilience|Vulnerability|Hands-on',
+    re.IGNORECASE)
+_ENTRY_SEMESTER_RES = (
+    re.compile(r'(BS|MS|PhD|EMBA|PMBA|MBA|BBA|MHRM|MPM|MMS)'),
+    re.compile(r'(BSAI|BSSE)'),  # AI and SE programs
+    re.compile(r'Core|Elective|Open|Zero'),  # Special qualifiers
+)
+_ENTRY_COURSE_RE = re.compile(r'\b[A-Z]{2,4}L?\s*(?:TE)?-?\s*\d{2,4}\b')
+_HEADER_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Cell values treated as missing after extraction
+_EMPTY_MARKERS = frozenset({'None', 'nan', ''})
+
+@lru_cache(maxsize=2048)
+def _normalize_semester_cached(semester: str) -> str:
+    """Normalize a semester label - memoized, the same few labels repeat on every row"""
+    # Remove extra spaces and normalize format
+    normalized = ' '.join(semester.split())
+    
+    # Handle space variations between BS/MS and parentheses
+    # Convert "BS (CS)" to "BS(CS)" and "BS(CS)" to "BS(CS)" (standardize to no space)
+    normalized = _SEMESTER_PROGRAM_PAREN_RE.sub(r'\1(', normalized)
+    
+    # Fix parentheses
+    normalized = _PARENS_RUN_RE.sub(lambda m: '(' if '(' in m.group() else ')', normalized)
+    
+    # DO NOT normalize MSS to MS(SS) - they are different semesters!
+    # MSS - 1 and MS(SS) - 1 are separate semesters that share classes
+    # We need to preserve both as distinct semester identities
+    
+    return normalized
+
+@lru_cache(maxsize=2048)
+def _compact_semester(normalized: str) -> str:
+    """Whitespace-free form of a normalized semester, for spacing-insensitive comparison"""
+    return _WS_RE.sub('', normalized)
+
+@lru_cache(maxsize=4096)
+def _semester_matches_cached(semester_cell: str, target_semester: str) -> bool:
+    """Memoized body of AdvancedTableParser._semester_matches - the same cell/target pairs recur across rows"""
+    cell_normalized = _normalize_semester_cached(semester_cell)
+    target_normalized = _normalize_semester_cached(target_semester)
+    
+    # Exact match
+    if cell_normalized == target_normalized:
+        return True
+    
+    # Handle slash-separated semesters (e.g., "EMBA - 1 / PMBA - 1")
+    if '/' in cell_normalized:
+        # Split by slash and check each part
+        semester_parts = [part.strip() for part in cell_normalized.split('/')]
+        target_compact = _compact_semester(target_normalized)
+        for part in semester_parts:
+            part_normalized = _normalize_semester_cached(part)
+            if part_normalized == target_normalized:
+                return True
+            # Check compact format only for exact semester variations (spacing)
+            part_compact = _compact_semester(part_normalized)
+            if part_compact == target_compact:
+                return True
+    
+    # Handle common variations and data errors
+    # BS(CS) - 5B might appear as BS(AI) - 5B in email (data error)
+    if target_normalized == "BS(CS) - 5B" and cell_normalized == "BS(AI) - 5B":
+        return True
+    if target_normalized == "BS(AI) - 5B" and cell_normalized == "BS(CS) - 5B":
+        return True
+        
+    # Flexible matching for spacing variations ONLY (no similarity matching)
+    cell_compact = _compact_semester(cell_normalized)
+    target_compact = _compact_semester(target_normalized)
+    if cell_compact == target_compact:
+        return True
+    
+    # Remove similarity matching to prevent false matches between EMBA/PMBA
+    return False
+
+# Field order of the tuples returned by _parse_schedule_line (and the text table columns)
+PARSED_ENTRY_FIELDS = ('sr_no', 'dept', 'program', 'semester', 'course', 'course_title',
+                       'faculty', 'room', 'time', 'campus', 'raw_line')
+
+def _parse_schedule_line(line: str) -> Optional[tuple]:
+    """
+    Parse a single schedule line into structured data - ENHANCED FOR ALL 39 SECTIONS
+    Returns a tuple in PARSED_ENTRY_FIELDS order - cheaper to load column-wise than a dict.
+    """
+    try:
+        logger.debug("🔧 Parsing entry: %.100s...", line)
+        
+        # Check if this is a cancelled class first - "Cancelled" is the usual spelling,
+        # the case-insensitive scan only runs when it's absent and never copies the line
+        is_cancelled = 'Cancelled' in line or _CANCELLED_RE.search(line) is not None
+        
+        # Extract serial number (at the beginning)
+        sr_match = _SR_NO_RE.match(line)
+        sr_no = sr_match.group(1) if sr_match else None
+        
+        # Extract department (after serial number, before program)
+        dept_match = _DEPT_RE.search(line)
+        dept = dept_match.group(1).strip() if dept_match else None
+        
+        # Extract semester - Enhanced to handle ALL section formats
+        
+        semester = None
+        for pattern in _SEMESTER_PATTERNS:
+            semester_match = pattern.search(line)
+            if semester_match:
+                semester = semester_match.group(1).strip()
+                logger.debug("✅ Found semester: %s", semester)
+                break
+        
+        # Extract course code - Enhanced for ALL course code formats INCLUDING DASHES
+        
+        # Every course pattern needs a digit, so lines without one skip the whole table
+        course = None
+        course_match = None
+        if _DIGIT_RE.search(line):
+            for pattern in _COURSE_PATTERNS:
+                course_match = pattern.search(line)
+                if course_match:
+                    course = course_match.group(1).strip()
+                    break
+        
+        # Extract course title - FIXED to handle "/" properly and NOT pick and choose
+        course_title = None
+        if course_match:
+            after_course = line[course_match.end():].strip()
+            
+            # For titles with "/", capture the ENTIRE title, don't split
+            # Pattern: Look for everything until faculty name or time
+            
+            for pattern in _TITLE_PATTERNS:
+                title_match = pattern.search(after_course)
+                if title_match:
+                    course_title = title_match.group(1).strip()
+                    break
+            
+            # Clean up course title - remove trailing punctuation but keep "/"
+            if course_title:
+                course_title = _TITLE_CREDITS_RE.sub('', course_title).strip()
+                course_title = _TITLE_TRAILING_RE.sub('', course_title).strip()
+                # If title is too short and has "/", it might be incomplete - try to get more
+                if '/' in course_title and len(course_title.split('/')[0].strip()) < 3:
+                    # Try to get a longer title
+                    extended_match = _TITLE_EXTENDED_RE.search(after_course)
+                    if extended_match:
+                        extended_title = extended_match.group(1).strip()
+                        if len(extended_title) > len(course_title):
+                            course_title = extended_title
+        
+        # Extract faculty name - Enhanced for ALL name formats
+        faculty = None
+        if not is_cancelled:
+            
+            for literal, pattern in _FACULTY_PATTERNS:
+                if literal is not None and literal not in line:
+                    continue
+                faculty_match = pattern.search(line)
+                if faculty_match:
+                    potential_faculty = faculty_match.group(1).strip()
+                    # Filter out common non-faculty words
+                    if _FACULTY_EXCLUDE_RE.search(potential_faculty) is None:
+                        faculty = potential_faculty
+                        break
+        else:
+            # For cancelled classes, try to extract faculty before "Cancelled"
+            # Enhanced to handle full names like "Dr. Muhammad Abo-Ul-Hassan Rashid"
+            
+            faculty = "CANCELLED"  # Default value
+            
+            for pattern in _CANCELLED_FACULTY_PATTERNS:
+                cancelled_faculty_match = pattern.search(line)
+                if cancelled_faculty_match:
+                    potential_faculty = cancelled_faculty_match.group(1).strip()
+                    # Make sure it's not just the word "Cancelled" itself
+                    if potential_faculty.lower() != 'cancelled' and len(potential_faculty) > 3:
+                        faculty = potential_faculty
+                        break
+        
+        # Extract time - Enhanced to handle various formats
+        # Both time patterns need "HH:MM", so a missing ':' rules them out up front
+        time = None
+        has_colon = ':' in line
+        if not is_cancelled:
+            
+            for pattern in (_TIME_PATTERNS if has_colon else ()):
+                time_match = pattern.search(line)
+                if time_match:
+                    time = ' '.join(time_match.group(1).split())  # Clean up spacing
+                    break
+        else:
+            # For cancelled classes, time might be on a separate line or after date
+            time_match = _TIME_PATTERNS[0].search(line) if has_colon else None
+            if time_match:
+                time = time_match.group(1).strip()
+            else:
+                time = "CANCELLED"
+        
+        # Extract room - Enhanced to handle various formats
+        room = None
+        if not is_cancelled:
+            
+            for literal, pattern in _ROOM_PATTERNS:
+                if literal is not None and literal not in line:
+                    continue
+                room_match = pattern.search(line)
+                if room_match:
+                    room = room_match.group(1).strip()
+                    break
+        else:
+            room = "CANCELLED"
+        
+        # Extract campus (usually at the end)
+        campus = None
+        campus_match = _CAMPUS_RE.search(line)
+        if campus_match:
+            campus = campus_match.group(1).strip()
+        elif not is_cancelled:
+            campus = "SZABIST University Campus"  # Default campus
+        else:
+            campus = "CANCELLED"
+        
+        # Determine program from semester pattern
+        program = None
+        if semester:
+            if semester.startswith('BS'):
+                program = 'BS'
+            elif semester.startswith('MS'):
+                program = 'MS' 
+            elif semester.startswith('PhD'):
+                program = 'PhD'
+            elif 'EMBA' in semester or 'PMBA' in semester or 'MBA' in semester:
+                program = 'MBA'
+            elif semester.startswith('BBA'):
+                program = 'BBA'
+            elif semester.startswith('MMS'):
+                program = 'MMS'
+            elif 'MHRM' in semester:
+                program = 'MHRM'
+            elif 'MPM' in semester:
+                program = 'MPM'
+            else:
+                program = 'Unknown'
+        
+        # Create the parsed item (PARSED_ENTRY_FIELDS order)
+        parsed_item = (
+            sr_no,
+            dept,
+            program,
+            semester,
+            course,
+            course_title,
+            faculty,
+            room,
+            time,
+            campus,
+            line[:100] + ('...' if len(line) > 100 else ''),  # raw_line, for debugging
+        )
+        
+        # Special handling for cancelled classes - still return them but mark as cancelled
+        if is_cancelled and semester and course:
+            logger.info(f"⚠️ Cancelled class parsed: {course} - {semester} - {faculty}")
+            return parsed_item
+        elif semester and course:
+            logger.debug("✅ Successfully parsed: %s - %s - Faculty: %s - Time: %s", course, semester, faculty, time)
+            return parsed_item
+        else:
+            logger.debug("❌ Missing essential fields - semester: %s, course: %s", semester, course)
+            return None
+            
+    except Exception as e:
+        logger.warning(f"❌ Failed to parse entry: {line[:50]}... Error: {e}")
+        return None
+
+
 class AdvancedTableParser:
+    # Candidate source columns for each extracted field, in priority order
+    EXTRACT_COLUMNS = {
+        'sr_no': ['sr_no', 'sr', 'serial', 0],
+        'dept': ['dept', 'department'],
+        'program': ['program'],
+        'semester': ['semester', 'class', 'section'],
+        'course': ['course_code', 'course', 'subject'],
+        'course_title': ['course_title', 'title', 'name'],
+        'faculty': ['faculty', 'teacher', 'instructor'],
+        'room': ['room', 'venue', 'location'],
+        'time': ['time', 'timing', 'schedule'],
+        'campus': ['campus', 'location'],
+        'credits': ['credits', 'cr'],
+    }
+    
     def __init__(self):
-        # Define expected column patterns (flexible matching)
-        self.column_patterns = {
+        # Define expected column patterns (flexible matching), compiled once per parser.
+        # Headers are lowercased before matching, so the patterns need no IGNORECASE
+        self.column_patterns = {col_type: re.compile(pattern) for col_type, pattern in {
             'sr_no': r'(?:sr\.?\s*no|serial|s\.?\s*no|#)',
             'dept': r'(?:dept|department)',
             'program': r'(?:program)',
@@ -28,34 +448,48 @@ class AdvancedTableParser:
             'time': r'(?:time|timing|schedule)',
             'campus': r'(?:campus)',
             'credits': r'(?:credits?|cr\.?)'
-        }
+        }.items()}
+        
+        # Resolved header -> column type; every table of an email repeats the same headers
+        self._header_matches = {}
         
         # Semester patterns for filtering
-        self.semester_patterns = [
+        self.semester_patterns = [re.compile(pattern) for pattern in (
             r'BS\s*\([A-Z]{2,4}\)\s*-\s*\d+[A-Z]',
             r'MS\s*\([A-Z]{2,4}\)\s*-\s*\d+[A-Z]',
             r'PhD\s*\([A-Z]{2,4}\)\s*-\s*\d+[A-Z]'
-        ]
+        )]
         
     def similarity(self, a: str, b: str) -> float:
         """Calculate similarity between two strings"""
+        if fuzz is not None:
+            return fuzz.ratio(a.lower(), b.lower()) / 100.0
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
     def find_best_column_match(self, header: str) -> Optional[str]:
         """Find the best matching column type for a header"""
-        header_clean = re.sub(r'[^\w\s]', '', header.lower().strip())
+        if header in self._header_matches:
+            return self._header_matches[header]
+        
+        best_match = self._match_column_header(header)
+        self._header_matches[header] = best_match
+        return best_match
+    
+    def _match_column_header(self, header: str) -> Optional[str]:
+        """Uncached header matching for find_best_column_match"""
+        header_clean = _HEADER_PUNCT_RE.sub('', header.lower().strip())
         
         best_match = None
         best_score = 0.0
         
         for col_type, pattern in self.column_patterns.items():
-            if re.search(pattern, header_clean, re.IGNORECASE):
+            match_obj = pattern.search(header_clean)
+            if match_obj:
                 # Exact match gets higher priority
                 if header_clean == col_type or header_clean.replace('_', '') == col_type.replace('_', ''):
                     return col_type
                     
-                match_obj = re.search(pattern, header_clean, re.IGNORECASE)
-                score = len(match_obj.group(0)) / len(header_clean) if match_obj else 0
+                score = len(match_obj.group(0)) / len(header_clean)
                 if score > best_score:
                     best_score = score
                     best_match = col_type
@@ -74,9 +508,16 @@ class AdvancedTableParser:
         except Exception as e:
             logger.warning(f"⚠️ Pandas read_html failed: {e}")
             
+        # One BeautifulSoup parse shared by the text extraction and the table fallback below
+        soup = None
+        try:
+            soup = BeautifulSoup(html_content, 'lxml')
+        except Exception as e:
+            logger.warning(f"⚠️ BeautifulSoup parse failed: {e}")
+        
         # Gmail emails often don't have proper tables - extract from text content
         try:
-            text_tables = self._extract_tables_from_text(html_content)
+            text_tables = self._extract_tables_from_text(html_content, soup)
             if text_tables:
                 logger.info(f"✅ Extracted {len(text_tables)} tables from text content")
                 tables.extend(text_tables)
@@ -86,7 +527,8 @@ class AdvancedTableParser:
         # Fallback: Use BeautifulSoup to clean and extract any remaining tables
         if not tables:
             try:
-                soup = BeautifulSoup(html_content, 'html.parser')
+                if soup is None:
+                    soup = BeautifulSoup(html_content, 'lxml')
                 table_elements = soup.find_all('table')
                 
                 if table_elements:
@@ -105,9 +547,10 @@ class AdvancedTableParser:
                 
         return tables
     
-    def _extract_tables_from_text(self, html_content: str) -> List[pd.DataFrame]:
+    def _extract_tables_from_text(self, html_content: str, soup: Optional[BeautifulSoup] = None) -> List[pd.DataFrame]:
         """Extract table data from text content (Gmail-style formatting) - ENHANCED FOR ALL 39 SECTIONS"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, 'lxml')
         
         # Get all text content, preserving line breaks
         text_content = soup.get_text('\n')
@@ -117,57 +560,58 @@ class AdvancedTableParser:
         
         # Enhanced multi-line reconstruction - FIXED for ALL section patterns
         schedule_entries = []
+        # lines are already stripped and non-empty
+        line_count = len(lines)
         i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        while i < line_count:
+            line = lines[i]
             
             # Look for lines starting with a number (schedule entries)
             # Enhanced pattern to catch ALL section formats including BS, EMBA, PMBA, etc.
-            if re.match(r'^\d+\s+[A-Z]{2,4}\s+', line):
-                # This is a schedule line that might span multiple lines
-                full_entry = line
+            if _ENTRY_START_RE.match(line):
+                # This is a schedule line that might span multiple lines - collect the
+                # pieces and join once instead of re-concatenating the entry per line
+                entry_parts = [line]
                 
                 # Look ahead for continuation lines more aggressively
                 j = i + 1
-                while j < len(lines) and j < i + 12:  # Look ahead up to 12 lines for complex entries
-                    next_line = lines[j].strip()
+                while j < line_count and j < i + 12:  # Look ahead up to 12 lines for complex entries
+                    next_line = lines[j]
                     
                     # Stop if we hit another numbered entry (new schedule item)
-                    if re.match(r'^\d+\s+[A-Z]{2,4}\s+', next_line):
+                    if _ENTRY_START_RE.match(next_line):
                         break
                     
                     # Stop if we hit emoji headers/separators
-                    if re.match(r'^[🕗🔸]', next_line):
+                    if next_line.startswith(_SEPARATOR_PREFIXES):
                         break
                     
                     # Include date/time information lines
-                    if re.match(r'^\d{1,2}-\d{1,2}-\d{4}', next_line):
-                        full_entry += " " + next_line
+                    if _DATE_LINE_RE.match(next_line):
+                        entry_parts.append(next_line)
                         j += 1
                         break
                     
                     # Add continuation lines that contain relevant data
                     if next_line:
-                        # Include lines with faculty names, times, rooms, etc.
-                        # Enhanced patterns for better continuation detection
-                        if (re.search(r'Dr\.|Prof\.|Mr\.|Ms\.|\d{1,2}:\d{2}\s*[AP]M|Hall|Lab|NB-|\d{3}|SZABIST|Campus|Cancelled|Accounting|Management|Ethics|Governance|Marketing|Analysis|Development|Research|International|Engineering|Programming|Computing|Vision|Technical|Business|Communication|Project|Risk|Organizational|Strategic|Supply|Chain|Operations|Fundamentals|Applied|Principles|Assessment|Diagnosis|Quantitative|Qualitative|Psychotherapy|Counseling|Media|Journalism|Participation|Community|Resilience|Vulnerability|Hands-on', next_line, re.IGNORECASE) or
-                            len(next_line.split()) <= 8):  # Medium lines are likely continuations
-                            full_entry += " " + next_line
+                        # Medium lines are likely continuations - the cheap word count goes first,
+                        # then lines with faculty names, times, rooms, etc. (the big keyword scan)
+                        if (len(next_line.split()) <= 8 or
+                            _CONTINUATION_RE.search(next_line)):
+                            entry_parts.append(next_line)
                     j += 1
                 
+                full_entry = " ".join(entry_parts)
+                
                 # Only include entries that have valid semester and course patterns
                 # Enhanced validation for ALL 39 section types
-                has_valid_semester = any([
-                    re.search(r'(BS|MS|PhD|EMBA|PMBA|MBA|BBA|MHRM|MPM|MMS)', full_entry),
-                    re.search(r'(BSAI|BSSE)', full_entry),  # AI and SE programs
-                    re.search(r'Core|Elective|Open|Zero', full_entry),  # Special qualifiers
-                ])
+                has_valid_semester = any(pattern.search(full_entry) for pattern in _ENTRY_SEMESTER_RES)
                 
-                has_valid_course = re.search(r'\b[A-Z]{2,4}L?\s*(?:TE)?-?\s*\d{2,4}\b', full_entry)
+                has_valid_course = _ENTRY_COURSE_RE.search(full_entry)
                 
                 if has_valid_semester and has_valid_course:
                     schedule_entries.append(full_entry)
-                    logger.debug(f"📝 Reconstructed entry {len(schedule_entries)}: {full_entry[:100]}...")
+                    logger.debug("📝 Reconstructed entry %d: %.100s...", len(schedule_entries), full_entry)
                 
                 i = j  # Skip the lines we've already processed
             else:
@@ -180,20 +624,22 @@ class AdvancedTableParser:
             return []
             
         # Parse entries into structured data
-        rows = []
-        for i, entry in enumerate(schedule_entries):
-            row_data = self._parse_schedule_line(entry)
+        parsed_entries = [_parse_schedule_line(entry) for entry in schedule_entries]
+        columns = [[] for _ in PARSED_ENTRY_FIELDS]
+        for i, row_data in enumerate(parsed_entries):
             if row_data:
-                rows.append(row_data)
+                for column, value in zip(columns, row_data):
+                    column.append(value)
                 if i < 5:  # Log first few for debugging
-                    logger.info(f"✅ Parsed entry {i+1}: {row_data.get('course')} - {row_data.get('semester')} - Faculty: {row_data.get('faculty')} - Time: {row_data.get('time')}")
+                    entry = dict(zip(PARSED_ENTRY_FIELDS, row_data))
+                    logger.info(f"✅ Parsed entry {i+1}: {entry['course']} - {entry['semester']} - Faculty: {entry['faculty']} - Time: {entry['time']}")
         
-        if not rows:
+        if not columns[0]:
             logger.warning("❌ No valid rows parsed from schedule entries")
             return []
             
-        # Create DataFrame with proper column mapping
-        df = pd.DataFrame(rows)
+        # Create DataFrame column-wise from the parsed fields
+        df = pd.DataFrame(dict(zip(PARSED_ENTRY_FIELDS, columns)))
         
         logger.info(f"✅ Created DataFrame from text with shape {df.shape}")
         logger.info(f"✅ Columns: {list(df.columns)}")
@@ -201,275 +647,23 @@ class AdvancedTableParser:
         return [df]
     
     def _parse_schedule_line(self, line: str) -> Optional[Dict]:
-        """Parse a single schedule line into structured data - ENHANCED FOR ALL 39 SECTIONS"""
-        try:
-            logger.debug(f"🔧 Parsing entry: {line[:100]}...")
-            
-            # Check if this is a cancelled class first
-            is_cancelled = 'Cancelled' in line or 'cancelled' in line.lower()
-            
-            # Extract serial number (at the beginning)
-            sr_match = re.match(r'^(\d+)\s+', line)
-            sr_no = sr_match.group(1) if sr_match else None
-            
-            # Extract department (after serial number, before program)
-            dept_match = re.search(r'^\d+\s+([A-Z/\s]+?)\s+(?:BS|MS|PhD|EMBA|PMBA|MBA|BBA|MHRM|MPM|MMS)', line)
-            dept = dept_match.group(1).strip() if dept_match else None
-            
-            # Extract semester - Enhanced to handle ALL section formats
-            semester_patterns = [
-                # Complex multi-section patterns like "EMBA - 1 / PMBA - 1 / MBA (72) Day / Eve - 1"
-                r'((?:EMBA|PMBA|MBA)\s*-\s*\d+(?:\s*/\s*(?:EMBA|PMBA|MBA)(?:\s*\(\d+\))?\s*(?:Day|Eve)?\s*-\s*\d+)*)',
-                # MS patterns with complex aliases like "MS (SS) - 1 / MSS - 1"
-                r'(MS\s*\([A-Z]{2,4}\)\s*-\s*[0-9A-Z]+(?:\s*/\s*[A-Z]{2,4}\s*-\s*[0-9A-Z]+)*)',
-                # BS patterns like "BS (CS) / BSSE Open", "BS(CS) - 8B"
-                r'(BS\s*\(?[A-Z]{2,4}\)?\s*(?:/\s*[A-Z]{2,4})?\s*(?:-\s*[0-9A-Z]+|Open))',
-                # Simple patterns like "BBA - 2", "MMS Zero", "MMS - 1"  
-                r'((?:BBA|MMS|MHRM|MPM)\s*(?:-\s*\d+|Zero))',
-                # AI patterns like "BSAI - 1B", "BSAI - 4A"
-                r'(BSAI\s*-\s*[0-9A-Z]+)',
-                # SE patterns like "BS (SE) - 4A"
-                r'(BS\s*\([A-Z]{2}\)\s*-\s*[0-9A-Z]+)',
-                # SS patterns like "BS (SS) - 5"
-                r'(BS\s*\([A-Z]{2}\)\s*-\s*\d+)',
-                # PM patterns with additional qualifiers like "MS (PM) - 1 A Core", "MS (PM) - 2 A & 3 A Elective"
-                r'(MS\s*\([A-Z]{2}\)\s*-\s*[0-9A-Z]+\s*[A-Z]*(?:\s*(?:Core|Elective|&\s*\d+\s*[A-Z]*\s*Elective))?)',
-                # Generic fallback for any pattern
-                r'([A-Z]{2,4}\s*(?:\([A-Z]{2,4}\))?\s*-\s*[0-9A-Z]+(?:\s*[A-Z]+)?)',
-            ]
-            
-            semester = None
-            for pattern in semester_patterns:
-                semester_match = re.search(pattern, line)
-                if semester_match:
-                    semester = semester_match.group(1).strip()
-                    logger.debug(f"✅ Found semester: {semester}")
-                    break
-            
-            # Extract course code - Enhanced for ALL course code formats INCLUDING DASHES
-            course_patterns = [
-                r'\b([A-Z]{2,4}L?\s*TE\d{2})\b',          # Special codes like "HR TE11", "PM TE03"
-                r'\b([A-Z]{2,4}L?\s*-?\s*\d{2,4})\b',     # Standard codes with optional dash: "BE-5105", "CSC 3202", "BE 5101"
-                r'\b([A-Z]{2,3}\s*-?\s*\d{2,4})\b',       # Short codes with optional dash: "MD-2323", "MD 2323"
-            ]
-            
-            course = None
-            for pattern in course_patterns:
-                course_match = re.search(pattern, line)
-                if course_match:
-                    course = course_match.group(1).strip()
-                    break
-            
-            # Extract course title - FIXED to handle "/" properly and NOT pick and choose
-            course_title = None
-            if course_match:
-                after_course = line[course_match.end():].strip()
-                
-                # For titles with "/", capture the ENTIRE title, don't split
-                # Pattern: Look for everything until faculty name or time
-                title_patterns = [
-                    # Pattern 1: Title with credits in parentheses before faculty
-                    r'^([^()]+(?:\([0-9,]+\))?)\s+(?:Dr\.|Prof\.|Mr\.|Ms\.|[A-Z][a-z]+\s+[A-Z][a-z]+)',
-                    # Pattern 2: Title until faculty name (multiple words starting with capital)
-                    r'^([^()]+?)\s+(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
-                    # Pattern 3: Title until room/time
-                    r'^([^()]+?)\s+(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
-                    # Pattern 4: Title with multiple "/" segments - capture ALL
-                    r'^([^()]+(?:/[^()]+)*?)(?:\s*\([0-9,]+\))?\s+(?:Dr\.|Prof\.|[A-Z][a-z]+)',
-                    # Pattern 5: Everything until first proper name or room
-                    r'^([^()]+?)(?:\s+(?:[A-Z][a-z]+\s+[A-Z][a-z]+|Dr\.|Prof\.)|\s+\d{3}|\s+Hall|\s+Lab)',
-                ]
-                
-                for pattern in title_patterns:
-                    title_match = re.search(pattern, after_course)
-                    if title_match:
-                        course_title = title_match.group(1).strip()
-                        break
-                
-                # Clean up course title - remove trailing punctuation but keep "/"
-                if course_title:
-                    course_title = re.sub(r'\s*\([0-9,]+\)\s*$', '', course_title).strip()
-                    course_title = re.sub(r'[-/\s]+$', '', course_title).strip()
-                    # If title is too short and has "/", it might be incomplete - try to get more
-                    if '/' in course_title and len(course_title.split('/')[0].strip()) < 3:
-                        # Try to get a longer title
-                        extended_match = re.search(r'^([^()]+(?:/[^()]+)*)', after_course)
-                        if extended_match:
-                            extended_title = extended_match.group(1).strip()
-                            if len(extended_title) > len(course_title):
-                                course_title = extended_title
-            
-            # Extract faculty name - Enhanced for ALL name formats
-            faculty = None
-            if not is_cancelled:
-                faculty_patterns = [
-                    # Pattern 1: "Dr. Faculty Name" (with title)
-                    r'\b(Dr\.\s+[A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z-]+)*)\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2}|Cancelled)',
-                    # Pattern 2: Faculty name before room/time (no title) - at least 2 words, handle mixed case
-                    r'\b([A-Z][a-z]+\s+[A-Za-z][a-z]*(?:\s+[A-Z][a-z]+)*)\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
-                    # Pattern 3: Faculty name before "Cancelled"
-                    r'\b([A-Z][a-z]+(?:\s+[A-Z]\.?)?(?:\s+[A-Z][a-z]+)*)\s+Cancelled',
-                    # Pattern 4: After credits pattern
-                    r'\([0-9,]+\)\s+([A-Z][A-Za-z\s]+?)\s+(?:-\s+)?(?:\d{3}|Hall|NB-|Lab|\d{1,2}:\d{2})',
-                    # Pattern 5: Single name patterns (for cases where only last name is given)
-                    r'\b([A-Z][a-z]{3,})\s+(?:-\s+)?(?:\d{3}|Hall|Lab|\d{1,2}:\d{2})',
-                ]
-                
-                for pattern in faculty_patterns:
-                    faculty_match = re.search(pattern, line)
-                    if faculty_match:
-                        potential_faculty = faculty_match.group(1).strip()
-                        # Filter out common non-faculty words
-                        exclude_words = ['Hall', 'Lab', 'Room', 'AM', 'PM', 'SZABIST', 'University', 'Campus', 
-                                       'Design', 'Analysis', 'Data', 'Computer', 'Assessment', 'Techniques',
-                                       'Management', 'Development', 'Research', 'International', 'Strategic',
-                                       'Marketing', 'Accounting', 'Business', 'Applied', 'Introduction',
-                                       'Fundamentals', 'Advanced', 'Principles', 'Ethics', 'Corporate']
-                        if not any(word in potential_faculty for word in exclude_words):
-                            faculty = potential_faculty
-                            break
-            else:
-                # For cancelled classes, try to extract faculty before "Cancelled"
-                # Enhanced to handle full names like "Dr. Muhammad Abo-Ul-Hassan Rashid"
-                cancelled_faculty_patterns = [
-                    r'(Dr\.\s+[A-Za-z\-\s\.]+?)\s+Cancelled',  # Dr. Full Name Cancelled
-                    r'(Prof\.\s+[A-Za-z\-\s\.]+?)\s+Cancelled',  # Prof. Full Name Cancelled  
-                    r'([A-Z][a-z]+(?:\s+[A-Za-z\-]+)*)\s+Cancelled',  # Name Cancelled (no title)
-                ]
-                
-                faculty = "CANCELLED"  # Default value
-                
-                for pattern in cancelled_faculty_patterns:
-                    cancelled_faculty_match = re.search(pattern, line, re.IGNORECASE)
-                    if cancelled_faculty_match:
-                        potential_faculty = cancelled_faculty_match.group(1).strip()
-                        # Make sure it's not just the word "Cancelled" itself
-                        if potential_faculty.lower() != 'cancelled' and len(potential_faculty) > 3:
-                            faculty = potential_faculty
-                            break
-            
-            # Extract time - Enhanced to handle various formats
-            time = None
-            if not is_cancelled:
-                time_patterns = [
-                    # Standard format: "08:00 AM - 09:30 AM"  
-                    r'(\d{1,2}:\d{2}\s*[AP]M\s*(?:-|–|—)\s*\d{1,2}:\d{2}\s*[AP]M)',
-                    # Single time: "08:00 AM"
-                    r'(\d{1,2}:\d{2}\s*[AP]M)',
-                ]
-                
-                for pattern in time_patterns:
-                    time_match = re.search(pattern, line)
-                    if time_match:
-                        time = time_match.group(1).strip()
-                        time = re.sub(r'\s+', ' ', time)  # Clean up spacing
-                        break
-            else:
-                # For cancelled classes, time might be on a separate line or after date
-                time_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M\s*(?:-|–|—)\s*\d{1,2}:\d{2}\s*[AP]M)', line)
-                if time_match:
-                    time = time_match.group(1).strip()
-                else:
-                    time = "CANCELLED"
-            
-            # Extract room - Enhanced to handle various formats
-            room = None
-            if not is_cancelled:
-                room_patterns = [
-                    r'\b(TV\s+Studio)\b',             # "TV Studio"
-                    r'\b(Media\s+Lab)\b',             # "Media Lab"  
-                    r'\b(Digital\s+Lab)\b',           # "Digital Lab"
-                    r'\b(Hall\s+\d+\s*[A-Z]?)\b',    # "Hall 01 A"
-                    r'\b(NB-\d+)\b',                  # "NB-206"
-                    r'\b(Lab\s+\d+)\b',               # "Lab 02" 
-                    r'\b(\d{3})\s+\d{1,2}:\d{2}',    # "305" before time
-                    r'\s(\d{3})\s',                   # "305" with spaces
-                ]
-                
-                for pattern in room_patterns:
-                    room_match = re.search(pattern, line)
-                    if room_match:
-                        room = room_match.group(1).strip()
-                        break
-            else:
-                room = "CANCELLED"
-            
-            # Extract campus (usually at the end)
-            campus = None
-            campus_match = re.search(r'(SZABIST[^$]+)$', line)
-            if campus_match:
-                campus = campus_match.group(1).strip()
-            elif not is_cancelled:
-                campus = "SZABIST University Campus"  # Default campus
-            else:
-                campus = "CANCELLED"
-            
-            # Determine program from semester pattern
-            program = None
-            if semester:
-                if semester.startswith('BS'):
-                    program = 'BS'
-                elif semester.startswith('MS'):
-                    program = 'MS' 
-                elif semester.startswith('PhD'):
-                    program = 'PhD'
-                elif 'EMBA' in semester or 'PMBA' in semester or 'MBA' in semester:
-                    program = 'MBA'
-                elif semester.startswith('BBA'):
-                    program = 'BBA'
-                elif semester.startswith('MMS'):
-                    program = 'MMS'
-                elif 'MHRM' in semester:
-                    program = 'MHRM'
-                elif 'MPM' in semester:
-                    program = 'MPM'
-                else:
-                    program = 'Unknown'
-            
-            # Create the parsed item
-            parsed_item = {
-                'sr_no': sr_no,
-                'dept': dept,
-                'program': program,
-                'semester': semester,
-                'course': course,
-                'course_title': course_title,
-                'faculty': faculty,
-                'room': room,
-                'time': time,
-                'campus': campus,
-                'raw_line': line[:100] + ('...' if len(line) > 100 else '')  # For debugging
-            }
-            
-            # Special handling for cancelled classes - still return them but mark as cancelled
-            if is_cancelled and semester and course:
-                logger.info(f"⚠️ Cancelled class parsed: {course} - {semester} - {faculty}")
-                return parsed_item
-            elif semester and course:
-                logger.debug(f"✅ Successfully parsed: {course} - {semester} - Faculty: {faculty} - Time: {time}")
-                return parsed_item
-            else:
-                logger.debug(f"❌ Missing essential fields - semester: {semester}, course: {course}")
-                return None
-                
-        except Exception as e:
-            logger.warning(f"❌ Failed to parse entry: {line[:50]}... Error: {e}")
-            return None
+        """Parse a single schedule line into structured data"""
+        parsed = _parse_schedule_line(line)
+        return dict(zip(PARSED_ENTRY_FIELDS, parsed)) if parsed else None
     
     def normalize_column_headers(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize and map column headers to standard names"""
-        df_copy = df.copy()
         column_mapping = {}
         
-        for col in df_copy.columns:
+        for col in df.columns:
             col_str = str(col).strip()
             best_match = self.find_best_column_match(col_str)
             if best_match:
                 column_mapping[col] = best_match
-                logger.debug(f"📝 Mapped column '{col}' -> '{best_match}'")
+                logger.debug("📝 Mapped column '%s' -> '%s'", col, best_match)
         
-        # Rename columns
-        df_copy = df_copy.rename(columns=column_mapping)
+        # Rename columns (rename returns a new frame, so the input table is left untouched)
+        df_copy = df.rename(columns=column_mapping)
         
         # If we don't have standard column names, try to infer from position
         if 'semester' not in df_copy.columns or 'course_code' not in df_copy.columns:
@@ -479,7 +673,7 @@ class AdvancedTableParser:
     
     def _infer_columns_by_position(self, df: pd.DataFrame) -> pd.DataFrame:
         """Infer column types based on typical timetable structure"""
-        df_copy = df.copy()
+        df_copy = df
         cols = list(df_copy.columns)
         
         # Common timetable column order patterns
@@ -516,12 +710,27 @@ class AdvancedTableParser:
             logger.warning("⚠️ No semester column found for filtering")
             return df
         
-        # Filter rows
-        mask = df[semester_col].astype(str).apply(
-            lambda x: any(self._semester_matches(x, target) for target in target_normalized)
+        # Filter rows - semester labels repeat on most rows, so match each distinct label once
+        # and select rows through the categorical codes
+        semesters = df[semester_col].astype(str).astype('category')
+        labels = semesters.cat.categories
+        
+        # Vectorized first pass: exact or spacing-insensitive equality, which _semester_matches
+        # would accept anyway; only the remaining labels go through the full matcher
+        target_forms = {_normalize_semester_cached(t) for t in target_normalized if t}
+        target_compacts = {_compact_semester(t) for t in target_forms}
+        labels_normalized = labels.map(_normalize_semester_cached)
+        quick_hits = (labels != '') & (
+            labels_normalized.isin(target_forms) |
+            labels_normalized.str.replace(_WS_RE, '', regex=True).isin(target_compacts)
         )
+        matching_codes = [
+            code for code, (label, hit) in enumerate(zip(labels, quick_hits))
+            if hit or any(self._semester_matches(label, target) for target in target_normalized)
+        ]
+        mask = semesters.cat.codes.isin(matching_codes)
         
-        filtered_df = df[mask].copy()
+        filtered_df = df[mask]  # boolean indexing already returns a new frame
         logger.info(f"🎯 Filtered from {len(df)} to {len(filtered_df)} rows for semesters: {target_semesters}")
         
         return filtered_df
@@ -531,166 +740,71 @@ class AdvancedTableParser:
         if not semester:
             return ""
         
-        # Remove extra spaces and normalize format
-        normalized = re.sub(r'\s+', ' ', semester.strip())
-        
-        # Handle space variations between BS/MS and parentheses
-        # Convert "BS (CS)" to "BS(CS)" and "BS(CS)" to "BS(CS)" (standardize to no space)
-        normalized = re.sub(r'\b(BS|MS|PhD)\s+\(', r'\1(', normalized)
-        
-        # Fix parentheses
-        normalized = re.sub(r'[\(\)]+', lambda m: '(' if '(' in m.group() else ')', normalized)
-        
-        # DO NOT normalize MSS to MS(SS) - they are different semesters!
-        # MSS - 1 and MS(SS) - 1 are separate semesters that share classes
-        # We need to preserve both as distinct semester identities
-        
-        return normalized
+        return _normalize_semester_cached(semester)
     
     def _semester_matches(self, semester_cell: str, target_semester: str) -> bool:
         """Check if a semester cell matches target semester"""
         if not semester_cell or not target_semester:
             return False
         
-        cell_normalized = self._normalize_semester(str(semester_cell))
-        target_normalized = self._normalize_semester(target_semester)
-        
-        # Exact match
-        if cell_normalized == target_normalized:
-            return True
-        
-        # Handle slash-separated semesters (e.g., "EMBA - 1 / PMBA - 1")
-        if '/' in cell_normalized:
-            # Split by slash and check each part
-            semester_parts = [part.strip() for part in cell_normalized.split('/')]
-            for part in semester_parts:
-                part_normalized = self._normalize_semester(part)
-                if part_normalized == target_normalized:
-                    return True
-                # Check compact format only for exact semester variations (spacing)
-                part_compact = re.sub(r'\s+', '', part_normalized)
-                target_compact = re.sub(r'\s+', '', target_normalized)
-                if part_compact == target_compact:
-                    return True
-        
-        # Handle common variations and data errors
-        # BS(CS) - 5B might appear as BS(AI) - 5B in email (data error)
-        if target_normalized == "BS(CS) - 5B" and cell_normalized == "BS(AI) - 5B":
-            return True
-        if target_normalized == "BS(AI) - 5B" and cell_normalized == "BS(CS) - 5B":
-            return True
-            
-        # Flexible matching for spacing variations ONLY (no similarity matching)
-        cell_compact = re.sub(r'\s+', '', cell_normalized)
-        target_compact = re.sub(r'\s+', '', target_normalized)
-        if cell_compact == target_compact:
-            return True
-        
-        # Remove similarity matching to prevent false matches between EMBA/PMBA
-        return False
+        return _semester_matches_cached(str(semester_cell), target_semester)
     
-    def _extract_matching_semester(self, semester_cell: str, target_semesters: List[str]) -> str:
-        """Extract the specific matching semester from a slash-separated string"""
-        if not semester_cell or not target_semesters:
-            return semester_cell
+    def extract_schedule_data(self, df: pd.DataFrame, target_semesters: List[str] = None) -> List[Dict]:
+        """Extract schedule data from normalized dataframe"""
+        schedule_items = []
         
-        cell_normalized = self._normalize_semester(str(semester_cell))
+        # Resolve candidate column names to column positions once, not per row
+        cols = {field: self._resolve_columns(df.columns, candidates)
+                for field, candidates in self.EXTRACT_COLUMNS.items()}
         
-        # If no slash, return as is
-        if '/' not in cell_normalized:
-            return semester_cell
+        # One array per field holding its first non-empty candidate value, built once per table
+        fields = self._coalesce_fields(df, cols)
         
-        # Split by slash and find the matching part
-        semester_parts = [part.strip() for part in cell_normalized.split('/')]
+        if not target_semesters:
+            # No filtering - every row keeps its own semester, so build all records in one go
+            return self._extract_all_records(fields)
         
-        for target in target_semesters:
-            target_normalized = self._normalize_semester(target)
-            target_compact = re.sub(r'\s+', '', target_normalized)
-            
-            for part in semester_parts:
-                part_normalized = self._normalize_semester(part)
-                part_compact = re.sub(r'\s+', '', part_normalized)
-                
-                # Check for exact match or compact match
-                if (part_normalized == target_normalized or 
-                    part_compact == target_compact):
-                    return part  # Return the matching part
+        raw_semesters = fields['semester'].tolist()
+        # Every field but the semester is cleaned column-wise; rows only swap in their semester(s)
+        records = self._clean_fields(fields).to_dict('records')
         
-        # If no specific match found, return original
-        return semester_cell
-    
-    def extract_schedule_data(self, df: pd.DataFrame, target_semesters: List[str] = None) -> List[Dict]:
-        """Extract schedule data from normalized dataframe"""
-        schedule_items = []
+        # Combined "A / B" semester cells are matched for the whole table at once
+        slash_semesters = {}
+        if target_semesters:
+            slash_semesters = self._match_slash_semesters(raw_semesters, target_semesters)
         
-        for idx, row in df.iterrows():
+        for pos, idx in enumerate(df.index):
             try:
                 # Extract semester first to check for slash-separated values
-                raw_semester = self._safe_extract(row, ['semester', 'class', 'section'])
+                raw_semester = raw_semesters[pos]
                 
                 # Determine which semesters to create entries for
                 semesters_to_create = []
                 
                 if target_semesters and raw_semester:
-                    # Check if this is a combined semester that matches multiple targets
-                    raw_normalized = self._normalize_semester(str(raw_semester))
-                    
-                    if '/' in raw_normalized:
-                        # Split by slash and check each part - treat each as a separate semester
-                        semester_parts = [part.strip() for part in raw_normalized.split('/')]
-                        
-                        for target in target_semesters:
-                            target_normalized = self._normalize_semester(target)
-                            target_compact = re.sub(r'\s+', '', target_normalized)
-                            
-                            for part in semester_parts:
-                                part_normalized = self._normalize_semester(part)
-                                part_compact = re.sub(r'\s+', '', part_normalized)
-                                
-                                # Check for exact match or compact match
-                                if (part_normalized == target_normalized or 
-                                    part_compact == target_compact):
-                                    # Keep the original part (not normalized) to preserve semester identity
-                                    # This allows both "MS(SS) - 1" and "MSS - 1" to be distinct
-                                    if part.strip() not in semesters_to_create:
-                                        semesters_to_create.append(part.strip())
-                                    break
+                    if pos in slash_semesters:
+                        # Combined semester - parts that matched a target, each a separate semester
+                        semesters_to_create.extend(slash_semesters[pos])
                     else:
-                        # Single semester, check if it matches any target
-                        filtered_semester = self._extract_matching_semester(raw_semester, target_semesters)
-                        if filtered_semester:
-                            semesters_to_create.append(filtered_semester)
+                        # Single semester - already matched by filter_by_semester, and with no "/"
+                        # there is no part to pick, so it is used as-is without re-normalizing
+                        semesters_to_create.append(raw_semester)
                 else:
                     # No filtering, use original semester
                     semesters_to_create.append(raw_semester)
                 
                 # Create an entry for each matching semester
                 for semester in semesters_to_create:
-                    if not semester:
+                    if not semester or semester in _EMPTY_MARKERS:
                         continue
-                        
-                    # Extract data with fallbacks
-                    item = {
-                        'sr_no': self._safe_extract(row, ['sr_no', 'sr', 'serial', 0]),
-                        'dept': self._safe_extract(row, ['dept', 'department']),
-                        'program': self._safe_extract(row, ['program']),
-                        'semester': semester,
-                        'course': self._safe_extract(row, ['course_code', 'course', 'subject']),
-                        'course_title': self._safe_extract(row, ['course_title', 'title', 'name']),
-                        'faculty': self._safe_extract(row, ['faculty', 'teacher', 'instructor']),
-                        'room': self._safe_extract(row, ['room', 'venue', 'location']),
-                        'time': self._safe_extract(row, ['time', 'timing', 'schedule']),
-                        'campus': self._safe_extract(row, ['campus', 'location']),
-                        'credits': self._safe_extract(row, ['credits', 'cr']),
-                    }
                     
-                    # Clean and validate data
-                    item = self._clean_extracted_data(item)
+                    item = dict(records[pos])
+                    item['semester'] = semester
                     
                     # Only add if we have essential data
-                    if item.get('course') and item.get('semester'):
+                    if item['course']:
                         schedule_items.append(item)
-                        logger.debug(f"✅ Extracted: {item['course']} for {item['semester']}")
+                        logger.debug("✅ Extracted: %s for %s", item['course'], item['semester'])
                 
             except Exception as e:
                 logger.warning(f"⚠️ Failed to extract row {idx}: {e}")
@@ -698,132 +812,154 @@ class AdvancedTableParser:
         
         return schedule_items
     
-    def _safe_extract(self, row: pd.Series, column_names: List) -> Optional[str]:
-        """Safely extract value from row using multiple possible column names"""
-        for col_name in column_names:
-            try:
-                if col_name in row.index:
-                    value = row[col_name]
-                    if pd.notna(value) and str(value).strip():
-                        return str(value).strip()
-                elif isinstance(col_name, int) and col_name < len(row):
-                    value = row.iloc[col_name]
-                    if pd.notna(value) and str(value).strip():
-                        return str(value).strip()
-            except:
-                continue
-        return None
+    def _coalesce_fields(self, df: pd.DataFrame, cols: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+        """Per field, the first non-empty value among its candidate columns for every row"""
+        # Stripped text per referenced column (None for empty cells), converted once per table
+        col_arrays = {pos: self._text_column(df, pos)
+                      for positions in cols.values() for pos in positions}
+        fields = {}
+        for field, positions in cols.items():
+            values = np.full(len(df), None, dtype=object)
+            for pos in positions:
+                take = pd.isna(values) & ~pd.isna(col_arrays[pos])
+                values[take] = col_arrays[pos][take]
+            fields[field] = values
+        return fields
     
-    def _clean_extracted_data(self, item: Dict) -> Dict:
-        """Clean and normalize extracted data"""
-        # Clean None values
-        for key in item:
-            if item[key] in [None, 'None', 'nan', '']:
-                item[key] = None
+    def _extract_all_records(self, fields: Dict[str, np.ndarray]) -> List[Dict]:
+        """Unfiltered extraction: clean every field column-wise, then keep rows with a course and semester"""
+        records = self._clean_fields(fields)
+        
+        # Only keep rows with essential data
+        records = records[records['course'].notna() & records['semester'].notna()]
+        schedule_items = records.to_dict('records')
+        logger.debug("✅ Extracted %d items without semester filtering", len(schedule_items))
+        
+        return schedule_items
+    
+    def _clean_fields(self, fields: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Clean and normalize extracted data, one vectorized pass per field (None for missing values)"""
+        frame = {}
+        for field, values in fields.items():
+            values = pd.Series(values, dtype=object)
+            # Clean None values
+            frame[field] = values.mask(values.isin(_EMPTY_MARKERS))
         
         # Normalize course codes
-        if item.get('course'):
-            item['course'] = re.sub(r'\s+', ' ', item['course']).strip()
+        frame['course'] = frame['course'].str.replace(_WS_RE, ' ', regex=True).str.strip()
         
         # Clean contaminated course titles
-        if item.get('course_title'):
-            course_title = str(item['course_title']).strip()
-            
-            # Remove trailing "Dr." or other faculty titles that got appended
-            # This handles cases like "Theories of International Relations Dr." 
-            # and "Quantitative Analysis for Decision Making Dr. Muhammad Shoaib"
-            trailing_faculty_pattern = r'\s+(Dr\.?|Prof\.?|Mr\.?|Ms\.?|Miss)\.?(?:\s+[A-Za-z\s\.]+)?$'
-            course_title = re.sub(trailing_faculty_pattern, '', course_title, flags=re.IGNORECASE)
-            
-            # Remove faculty names from course title (Dr., Prof., Mr., Ms., etc.)
-            # Look for patterns like "Course Title Dr. Name" or "Course Title / Additional Course Dr. Name"
-            faculty_pattern = r'\s+(Dr\.?|Prof\.?|Mr\.?|Ms\.?|Miss)\s+[A-Za-z\s\.]+$'
-            course_title = re.sub(faculty_pattern, '', course_title, flags=re.IGNORECASE)
-            
-            # Remove additional course codes that got mixed in (e.g., "/ BA 5322 Financial Accounting...")
-            # Pattern: "/ [A-Z]{2,4} \d{4} ..."
-            additional_course_pattern = r'\s*/\s*[A-Z]{2,4}\s*\d{4}.*'
-            course_title = re.sub(additional_course_pattern, '', course_title)
-            
-            # Clean up extra slashes and spaces
-            course_title = re.sub(r'\s*/\s*$', '', course_title)  # Remove trailing slash
-            course_title = re.sub(r'\s+', ' ', course_title).strip()  # Normalize spaces
-            
-            # If the title is too short (likely truncated), try to reconstruct from raw_line
-            if len(course_title) < 5 and item.get('raw_line'):
-                extracted_title = self._extract_course_title_from_raw(item['raw_line'], item.get('course', ''))
-                if extracted_title and len(extracted_title) > len(course_title):
-                    course_title = extracted_title
-            
-            item['course_title'] = course_title if course_title else None
-        
-        # Clean faculty names
-        if item.get('faculty'):
-            faculty = str(item['faculty']).strip()
-            # Remove "CANCELLED" from faculty field
-            if faculty.upper() == 'CANCELLED':
-                item['faculty'] = 'CANCELLED'
-            else:
-                # Normalize faculty names
-                faculty = re.sub(r'\s+', ' ', faculty).strip()
-                item['faculty'] = faculty
+        title = frame['course_title'].str.strip().str.replace(_TRAILING_FACULTY_RE, '', regex=True)
+        has_slash = title.str.contains('/', regex=False, na=False)
+        title[has_slash] = (title[has_slash]
+                            .str.replace(_ADDITIONAL_COURSE_RE, '', regex=True)
+                            .str.replace(_TRAILING_SLASH_RE, '', regex=True))
+        title = title.str.replace(_WS_RE, ' ', regex=True).str.strip()
+        frame['course_title'] = title.mask(title == '')
+        
+        # Clean faculty names - keep CANCELLED markers, normalize the rest
+        faculty = frame['faculty'].str.strip()
+        frame['faculty'] = (faculty.str.replace(_WS_RE, ' ', regex=True).str.strip()
+                            .mask(faculty.str.upper() == 'CANCELLED', 'CANCELLED'))
         
         # Normalize times
-        if item.get('time'):
-            time_str = item['time']
-            # Try to fix common time format issues
-            time_str = re.sub(r'(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})', 
-                            r'\1:\2 - \3:\4', time_str)
-            item['time'] = time_str
+        frame['time'] = frame['time'].str.replace(_TIME_RANGE_RE, r'\1:\2 - \3:\4', regex=True)
         
         # Set default campus for numbered rooms
-        if item.get('room') and not item.get('campus'):
-            if re.match(r'^\d{3}$', str(item['room'])):
-                item['campus'] = 'SZABIST University Campus'
+        numbered_room = frame['room'].str.fullmatch(_ROOM_NUMBER_RE, na=False) & frame['campus'].isna()
+        frame['campus'] = frame['campus'].mask(numbered_room, 'SZABIST University Campus')
         
-        return item
+        records = pd.DataFrame(frame)
+        return records.astype(object).where(records.notna(), None)
     
-    def _extract_course_title_from_raw(self, raw_line: str, course_code: str) -> str:
-        """Extract course title from raw line when the parsed title is truncated"""
-        if not raw_line or not course_code:
-            return ""
+    def _match_slash_semesters(self, raw_semesters: List[Optional[str]], target_semesters: List[str]) -> Dict[int, List[str]]:
+        """
+        Match slash-separated semester cells against the targets for a whole table.
+        Returns {row position: matching parts} for every row whose normalized semester contains "/".
+        """
+        normalized = pd.Series(raw_semesters, dtype=object).map(
+            lambda sem: self._normalize_semester(str(sem)) if sem else "")
+        slashed = normalized[normalized.str.contains('/', regex=False)]
+        if slashed.empty:
+            return {}
         
-        try:
-            # Look for pattern: "COURSE_CODE Full Course Title (credits)" 
-            # More flexible pattern to handle various formats
-            patterns = [
-                rf'{re.escape(course_code)}\s+([^(]+?)\s*\([^)]+\)',  # Standard format
-                rf'{re.escape(course_code)}\s+([^/]+?)(?:\s*/|\s+(?:Dr\.|Prof\.|Mr\.|Ms\.))',  # Before slash or faculty
-                rf'{re.escape(course_code)}\s+(.+?)(?:\s+\(\d+,\d+\))',  # Before credits pattern
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, raw_line, re.IGNORECASE)
-                if match:
-                    title = match.group(1).strip()
-                    
-                    # Clean up the title
-                    # Remove credits info that might be included
-                    title = re.sub(r'\s*\(\d+,\d+\).*', '', title)
-                    
-                    # Remove faculty names
-                    faculty_pattern = r'\s+(Dr\.?|Prof\.?|Mr\.?|Ms\.?)\s+[A-Za-z\s\.]+$'
-                    title = re.sub(faculty_pattern, '', title, flags=re.IGNORECASE)
-                    
-                    # Clean up extra spaces and slashes
-                    title = re.sub(r'\s+', ' ', title).strip()
-                    title = re.sub(r'\s*/\s*$', '', title)  # Remove trailing slash
-                    
-                    if len(title) > 3:  # Only return if we got a meaningful title
-                        return title
-                        
-        except Exception as e:
-            logger.debug(f"Failed to extract title from raw line: {e}")
-            
-        return ""
+        targets = []
+        for target in target_semesters:
+            target_normalized = self._normalize_semester(target)
+            targets.append((target_normalized, _compact_semester(target_normalized)))
+        target_norm_set = {norm for norm, _ in targets}
+        target_compact_set = {compact for _, compact in targets}
+        
+        # One row per (cell, part). Parts repeat heavily, so factorize them to integer codes,
+        # test each distinct part once, and broadcast the result back through the codes
+        parts = slashed.str.split('/').explode().str.strip()
+        codes, uniques = pd.factorize(parts.to_numpy())
+        unique_hits = np.array([
+            _normalize_semester_cached(part) in target_norm_set or
+            _compact_semester(_normalize_semester_cached(part)) in target_compact_set
+            for part in uniques
+        ], dtype=bool)
+        hits = (codes >= 0) & unique_hits[codes] if len(uniques) else np.zeros(len(codes), dtype=bool)
+        matched_rows = set(parts.index[hits])
+        
+        results = {}
+        for pos in slashed.index:
+            semesters = []
+            seen = set()
+            if pos in matched_rows:
+                # Normalize each part once, not once per target
+                semester_parts = []
+                for part in slashed[pos].split('/'):
+                    part = part.strip()
+                    part_normalized = self._normalize_semester(part)
+                    semester_parts.append((part, part_normalized, _compact_semester(part_normalized)))
+                
+                for target_normalized, target_compact in targets:
+                    for part, part_normalized, part_compact in semester_parts:
+                        # Check for exact match or compact match
+                        if (part_normalized == target_normalized or 
+                            part_compact == target_compact):
+                            # Keep the original part (not normalized) to preserve semester identity
+                            # This allows both "MS(SS) - 1" and "MSS - 1" to be distinct
+                            if part not in seen:
+                                seen.add(part)
+                                semesters.append(part)
+                            break
+            results[pos] = semesters
+        return results
+    
+    def _resolve_columns(self, columns: pd.Index, column_names: List) -> List[int]:
+        """Map candidate column names (or integer positions) to distinct column positions, in priority order"""
+        positions = []
+        for col_name in column_names:
+            try:
+                if col_name in columns:
+                    loc = columns.get_loc(col_name)
+                    # Duplicated labels give a slice/mask, never a single cell - skip them
+                    if not isinstance(loc, int):
+                        continue
+                elif isinstance(col_name, int) and col_name < len(columns):
+                    loc = col_name
+                else:
+                    continue
+                # A later candidate naming an already-resolved column can never win the fallback
+                if loc not in positions:
+                    positions.append(loc)
+            except Exception:
+                continue
+        return positions
+    
+    def _text_column(self, df: pd.DataFrame, pos: int) -> np.ndarray:
+        """Column at pos as stripped strings, with None for missing or blank cells"""
+        column = df.iloc[:, pos]
+        text = column.astype(str).str.strip()
+        present = (column.notna() & (text != '')).to_numpy(dtype=bool)
+        return np.where(present, text.to_numpy(dtype=object), None)
     
+    # Target order decides the order of split "A / B" entries, so it is part of the cache key
+    @cached_parse(key_targets=tuple)
     def parse_timetable(self, html_content: str, target_semesters: List[str] = None) -> List[Dict]:
-        """Main method to parse timetable from HTML"""
+        """Main method to parse timetable from HTML, reusing the result for an identical email"""
         logger.info("🚀 Starting advanced pandas-based table parsing")
         logger.info(f"🎯 Target semesters: {target_semesters}")
         
@@ -869,15 +1005,23 @@ class AdvancedTableParser:
             
             # Log what we found for debugging
             if all_schedule_items:
-                semesters_found = list(set(item.get('semester') for item in all_schedule_items if item.get('semester')))
-                logger.info(f"🔍 Semesters found: {semesters_found}")
+                semesters_found = {item['semester'] for item in all_schedule_items if item.get('semester')}
+                logger.info(f"🔍 Semesters found: {sorted(semesters_found)}")
                 logger.info(f"🔍 Target semesters: {target_semesters}")
                 
                 # Check if we got what we expected
                 if target_semesters and len(all_schedule_items) > 0:
-                    expected_found = any(any(self._semester_matches(found, target) for target in target_semesters) for found in semesters_found)
+                    # Exact/compact set intersection settles the usual case; the full pairwise
+                    # scan only runs when that misses (slash parts, known data-error aliases)
+                    target_forms = {_normalize_semester_cached(t) for t in target_semesters if t}
+                    found_forms = {_normalize_semester_cached(f) for f in semesters_found}
+                    expected_found = (
+                        not target_forms.isdisjoint(found_forms) or
+                        not {_compact_semester(t) for t in target_forms}.isdisjoint(_compact_semester(f) for f in found_forms) or
+                        any(any(self._semester_matches(found, target) for target in target_semesters) for found in semesters_found)
+                    )
                     if not expected_found:
-                        logger.warning(f"⚠️ Expected semesters {target_semesters} but found {semesters_found}")
+                        logger.warning(f"⚠️ Expected semesters {target_semesters} but found {sorted(semesters_found)}")
             
             return all_schedule_items
             
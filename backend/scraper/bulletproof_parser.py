@@ -5,17 +5,62 @@ and correctly filter by semester with 100% accuracy.
 """
 
 import pandas as pd
+import numpy as np
 import re
+import sys
 import logging
 from typing import List, Dict, Optional, Any
 from bs4 import BeautifulSoup
 import warnings
+from functools import lru_cache
+
+from .utils import cached_parse
 
 # Suppress pandas warnings for cleaner output
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
 
+# Semester normalization patterns, compiled once at import instead of per cell
+_SEMESTER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'BS\s*\(\s*([A-Z]+)\s*\)\s*-?\s*(\d+\s*[A-Z])',  # BS(CS)-5C, BS (AI) - 3A
+    r'([A-Z]+)\s*\(\s*([A-Z]+)\s*\)\s*-?\s*(\d+\s*[A-Z])',  # General format
+    r'([A-Z]+)\s+([A-Z]+)\s+-?\s*(\d+\s*[A-Z])',  # Alternative format
+))
+# Any of the semester patterns, for column detection where only "does it look like one" matters
+_SEMESTER_ANY_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in _SEMESTER_PATTERNS), re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+# "CSC 3109 Software Engineering (3,0)" -> code, title (trailing credits dropped)
+_COURSE_TITLE_RE = re.compile(r'([A-Z]{2,4}\s*\d{3,4})\s+(.+?)(?:\s*\([0-9,.\s]+\))?$')
+# Presentation attributes that confuse pandas, removed from each table in one pass
+_ATTR_STRIP_RE = re.compile(r'(?:style|class|bgcolor)="[^"]*"')
+_TABLE_TAG_RE = re.compile(r'<table\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_semester_cached(semester_str: str) -> str:
+    """normalize_semester for a non-empty string - section strings repeat on every row"""
+    # Remove extra whitespace
+    clean = _WS_RE.sub(' ', semester_str.strip())
+    
+    # Try different patterns
+    for pattern in _SEMESTER_PATTERNS:
+        match = pattern.match(clean)
+        if match:
+            groups = match.groups()
+            if len(groups) == 2:  # BS(XX)-YZ format
+                degree, section = groups
+                section = _WS_RE.sub('', section)  # Remove spaces in section
+                return f"BS({degree.upper()})-{section.upper()}"
+            elif len(groups) == 3:  # Other formats
+                degree, program, section = groups
+                section = _WS_RE.sub('', section)  # Remove spaces in section
+                return f"{degree.upper()}({program.upper()})-{section.upper()}"
+    
+    # If no pattern matches, return cleaned version
+    return clean.upper()
+
+
 class BulletproofTableParser:
     """
     Bulletproof table parser that uses pandas for robust table extraction.
@@ -37,37 +82,14 @@ class BulletproofTableParser:
             'format_alt': ['semester', 'course_title', 'faculty', 'room', 'time', 'campus']
         }
         
-        # Semester normalization patterns
-        self.semester_patterns = [
-            r'BS\s*\(\s*([A-Z]+)\s*\)\s*-?\s*(\d+\s*[A-Z])',  # BS(CS)-5C, BS (AI) - 3A
-            r'([A-Z]+)\s*\(\s*([A-Z]+)\s*\)\s*-?\s*(\d+\s*[A-Z])',  # General format
-            r'([A-Z]+)\s+([A-Z]+)\s+-?\s*(\d+\s*[A-Z])',  # Alternative format
-        ]
+        # Semester normalization patterns (precompiled, shared by all instances)
+        self.semester_patterns = _SEMESTER_PATTERNS
 
     def normalize_semester(self, semester_str: str) -> str:
         """Normalize semester string to standard format BS(XX)-YZ"""
         if not semester_str:
             return ""
-        
-        # Remove extra whitespace
-        clean = re.sub(r'\s+', ' ', semester_str.strip())
-        
-        # Try different patterns
-        for pattern in self.semester_patterns:
-            match = re.match(pattern, clean, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                if len(groups) == 2:  # BS(XX)-YZ format
-                    degree, section = groups
-                    section = re.sub(r'\s+', '', section)  # Remove spaces in section
-                    return f"BS({degree.upper()})-{section.upper()}"
-                elif len(groups) == 3:  # Other formats
-                    degree, program, section = groups
-                    section = re.sub(r'\s+', '', section)  # Remove spaces in section
-                    return f"{degree.upper()}({program.upper()})-{section.upper()}"
-        
-        # If no pattern matches, return cleaned version
-        return clean.upper()
+        return _normalize_semester_cached(semester_str)
 
     def extract_all_tables_from_html(self, html: str) -> List[pd.DataFrame]:
         """Extract all tables from HTML using pandas with multiple fallback strategies"""
@@ -76,6 +98,12 @@ class BulletproofTableParser:
         
         self.logger.info(f"Attempting to extract tables from HTML ({len(html)} chars)")
         
+        # Plain-text schedule emails have no table at all - every strategy below would
+        # re-parse the whole document just to find nothing
+        if not _TABLE_TAG_RE.search(html):
+            self.logger.info("No <table> element in HTML - skipping table extraction")
+            return []
+        
         try:
             # Strategy 1: Direct pandas parsing with different options
             parsing_options = [
@@ -89,66 +117,62 @@ class BulletproofTableParser:
             tables = []
             for i, options in enumerate(parsing_options):
                 try:
-                    self.logger.info(f"Trying pandas parsing strategy {i+1}")
+                    self.logger.info("Trying pandas parsing strategy %d", i + 1)
                     found_tables = pd.read_html(html, **options)
                     if found_tables:
-                        self.logger.info(f"Strategy {i+1} found {len(found_tables)} tables")
+                        self.logger.info("Strategy %d found %d tables", i + 1, len(found_tables))
                         tables.extend(found_tables)
                         break  # Use first successful parsing
                 except Exception as e:
-                    self.logger.debug(f"Strategy {i+1} failed: {e}")
+                    self.logger.debug("Strategy %d failed: %s", i + 1, e)
                     continue
             
             # Strategy 2: BeautifulSoup preprocessing + pandas
             if not tables:
                 self.logger.info("Direct pandas failed, trying BeautifulSoup preprocessing")
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = BeautifulSoup(html, 'lxml')
                 
                 # Find all table elements
                 table_elements = soup.find_all('table')
-                self.logger.info(f"Found {len(table_elements)} table elements in HTML")
+                self.logger.info("Found %d table elements in HTML", len(table_elements))
                 
                 for j, table_elem in enumerate(table_elements):
                     try:
-                        # Clean up the table HTML for pandas
-                        table_html = str(table_elem)
-                        
-                        # Remove problematic attributes that might confuse pandas
-                        table_html = re.sub(r'style="[^"]*"', '', table_html)
-                        table_html = re.sub(r'class="[^"]*"', '', table_html)
-                        table_html = re.sub(r'bgcolor="[^"]*"', '', table_html)
+                        # Clean up the table HTML for pandas - remove problematic attributes
+                        table_html = _ATTR_STRIP_RE.sub('', str(table_elem))
                         
-                        self.logger.info(f"Trying to parse table element {j+1}")
+                        self.logger.info("Trying to parse table element %d", j + 1)
                         found_tables = pd.read_html(table_html, header=0)
                         if found_tables:
-                            self.logger.info(f"Table element {j+1} parsed successfully")
+                            self.logger.info("Table element %d parsed successfully", j + 1)
                             tables.extend(found_tables)
                     except Exception as e:
-                        self.logger.debug(f"Table element {j+1} failed: {e}")
+                        self.logger.debug("Table element %d failed: %s", j + 1, e)
                         continue
             
             # Strategy 3: Manual table extraction as last resort
             if not tables:
                 self.logger.info("Pandas parsing failed completely, trying manual extraction")
-                tables = self._manual_table_extraction(html)
+                tables = self._manual_table_extraction(html, soup)
             
             self.logger.info(f"Final result: Found {len(tables)} tables using all strategies")
             
             # Filter and validate tables
             valid_tables = []
             for i, table in enumerate(tables):
-                self.logger.info(f"Raw table {i+1}: {table.shape[0]} rows, {table.shape[1]} columns")
-                if len(table.columns) > 0:
-                    self.logger.info(f"Table {i+1} columns: {list(table.columns)}")
-                if table.shape[0] > 0:
-                    self.logger.info(f"Table {i+1} sample data: {table.head(2).to_dict()}")
+                self.logger.info("Raw table %d: %d rows, %d columns", i + 1, table.shape[0], table.shape[1])
+                # Column lists and sample rows are only built when debug logging is on
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    if len(table.columns) > 0:
+                        self.logger.debug("Table %d columns: %s", i + 1, list(table.columns))
+                    if table.shape[0] > 0:
+                        self.logger.debug("Table %d sample data: %s", i + 1, table.head(2).to_dict())
                 
                 if table.shape[0] > 0 and table.shape[1] >= 3:  # At least 1 row and 3 columns
                     valid_tables.append(table)
-                    self.logger.info(f"Table {i+1}: VALID - {table.shape[0]} rows, {table.shape[1]} columns")
+                    self.logger.info("Table %d: VALID - %d rows, %d columns", i + 1, table.shape[0], table.shape[1])
                 else:
-                    self.logger.info(f"Table {i+1}: SKIPPED - too small")
+                    self.logger.info("Table %d: SKIPPED - too small", i + 1)
             
             return valid_tables
             
@@ -156,11 +180,11 @@ class BulletproofTableParser:
             self.logger.error(f"All table extraction strategies failed: {e}")
             return []
 
-    def _manual_table_extraction(self, html: str) -> List[pd.DataFrame]:
-        """Manual table extraction as fallback when pandas fails"""
+    def _manual_table_extraction(self, html: str, soup: Optional[BeautifulSoup] = None) -> List[pd.DataFrame]:
+        """Manual table extraction as fallback when pandas fails (reuses the caller's soup if given)"""
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'html.parser')
+            if soup is None:
+                soup = BeautifulSoup(html, 'lxml')
             
             tables = []
             table_elements = soup.find_all('table')
@@ -183,7 +207,7 @@ class BulletproofTableParser:
                     try:
                         df = pd.DataFrame(table_data[1:], columns=table_data[0])
                         tables.append(df)
-                        self.logger.info(f"Manual extraction created table: {df.shape[0]} rows, {df.shape[1]} columns")
+                        self.logger.info("Manual extraction created table: %d rows, %d columns", df.shape[0], df.shape[1])
                     except Exception as e:
                         self.logger.debug(f"Manual DataFrame creation failed: {e}")
                         continue
@@ -210,14 +234,11 @@ class BulletproofTableParser:
             sample_values = df.iloc[:, col_idx].dropna().astype(str).head(10)
             
             # Count how many look like semester patterns
-            semester_count = 0
-            for value in sample_values:
-                if any(re.search(pattern, value, re.IGNORECASE) for pattern in self.semester_patterns):
-                    semester_count += 1
+            semester_count = sum(1 for value in sample_values if _SEMESTER_ANY_RE.search(value))
             
             # If most values look like semesters, this is likely the right column
             if semester_count >= len(sample_values) * 0.6:  # 60% threshold
-                self.logger.info(f"Found class/section column by pattern: column {col_idx} ({semester_count}/{len(sample_values)} matches)")
+                self.logger.info("Found class/section column by pattern: column %d (%d/%d matches)", col_idx, semester_count, len(sample_values))
                 return col_idx
         
         # Fallback: assume it's column 3 (0-indexed) for 9-column format
@@ -239,8 +260,8 @@ class BulletproofTableParser:
             return df
         
         # Normalize target semesters
-        normalized_targets = [self.normalize_semester(sem) for sem in target_semesters]
-        self.logger.info(f"Normalized target semesters: {normalized_targets}")
+        normalized_targets = frozenset(self.normalize_semester(sem) for sem in target_semesters)
+        self.logger.info(f"Normalized target semesters: {sorted(normalized_targets)}")
         
         # Find the class/section column
         class_col_idx = self.find_class_section_column(df)
@@ -250,28 +271,28 @@ class BulletproofTableParser:
         
         self.logger.info(f"Using column {class_col_idx} for semester filtering")
         
-        # Create a mask for matching rows
-        mask = pd.Series([False] * len(df))
+        # Section strings repeat on every row, so each distinct cell value is normalized
+        # and checked once, then the result is broadcast back through the codes
+        column = df.iloc[:, class_col_idx]
+        values = column.where(column.notna(), "").astype(str)
+        codes, uniques = pd.factorize(values.to_numpy())
         
-        for idx, row in df.iterrows():
-            # Get the value from the class/section column
-            class_section_value = str(row.iloc[class_col_idx]) if pd.notna(row.iloc[class_col_idx]) else ""
-            
-            if not class_section_value or class_section_value.lower() in ['nan', 'none', '']:
+        unique_hits = np.zeros(len(uniques), dtype=bool)
+        for i, class_section_value in enumerate(uniques):
+            if class_section_value.lower() in ['nan', 'none', '']:
                 continue
             
             # Normalize the value from the table
             normalized_row_semester = self.normalize_semester(class_section_value)
             
             # Check if it matches any target semester
-            for target in normalized_targets:
-                if normalized_row_semester == target:
-                    mask.iloc[idx] = True
-                    self.logger.info(f"MATCH: '{class_section_value}' -> '{normalized_row_semester}' matches '{target}'")
-                    break
-            
-            if not mask.iloc[idx]:
-                self.logger.debug(f"NO MATCH: '{class_section_value}' -> '{normalized_row_semester}' (targets: {normalized_targets})")
+            if normalized_row_semester in normalized_targets:
+                unique_hits[i] = True
+                self.logger.info("MATCH: '%s' -> '%s' matches a target", class_section_value, normalized_row_semester)
+            else:
+                self.logger.debug("NO MATCH: '%s' -> '%s' (targets: %s)", class_section_value, normalized_row_semester, normalized_targets)
+        
+        mask = unique_hits[codes]
         
         # Apply the filter
         filtered_df = df[mask]
@@ -331,32 +352,38 @@ class BulletproofTableParser:
             self.logger.error(f"Unsupported table format with {len(df.columns)} columns")
             return []
         
-        self.logger.info(f"Using column mapping for {len(df.columns)} columns: {col_map}")
+        self.logger.info("Using column mapping for %d columns: %s", len(df.columns), col_map)
         
-        for idx, row in df.iterrows():
+        # Plain positional tuples - no per-row Series boxing
+        for idx, *row in df.itertuples(index=True, name=None):
+            # Cell text, computed once for raw_cells, full_text and the mapped fields
+            cells = [str(cell) if pd.notna(cell) else "" for cell in row]
+            
             # Extract values using column mapping
             def get_value(field: str) -> str:
                 col_idx = col_map.get(field)
-                if col_idx is not None and col_idx < len(row):
-                    value = row.iloc[col_idx]
-                    return str(value).strip() if pd.notna(value) else ""
+                if col_idx is not None and col_idx < len(cells):
+                    return cells[col_idx].strip()
                 return ""
             
+            # Low-cardinality fields repeat across most rows - intern them so the items share one string each
+            class_section = sys.intern(get_value('class_section'))
+            
             # Create schedule item
             item = {
                 'sr_no': get_value('sr_no'),
-                'dept': get_value('dept'),
-                'program': get_value('program'),
-                'class_section': get_value('class_section'),
+                'dept': sys.intern(get_value('dept')),
+                'program': sys.intern(get_value('program')),
+                'class_section': class_section,
                 'course': get_value('course'),
                 'faculty': get_value('faculty'),
-                'room': get_value('room') or 'TBD',
+                'room': sys.intern(get_value('room') or 'TBD'),
                 'time': get_value('time') or 'TBD',
-                'campus': get_value('campus') or 'SZABIST University Campus',
-                'semester': get_value('class_section'),  # Use class_section as semester
-                'raw_cells': [str(cell) if pd.notna(cell) else "" for cell in row.values],
+                'campus': sys.intern(get_value('campus') or 'SZABIST University Campus'),
+                'semester': class_section,  # Use class_section as semester
+                'raw_cells': cells,
                 'source_line': idx + 1,
-                'full_text': ' | '.join([str(cell) if pd.notna(cell) else "" for cell in row.values])
+                'full_text': ' | '.join(cells)
             }
             
             # Extract course title if it's embedded in the course field
@@ -379,7 +406,7 @@ class BulletproofTableParser:
             return ""
         
         # Pattern: "CSC 3109 Software Engineering (3,0)"
-        match = re.match(r'^([A-Z]{2,4}\s*\d{3,4})\s+(.+?)(?:\s*\([0-9,\.\s]+\))?$', course_str)
+        match = _COURSE_TITLE_RE.match(course_str)
         if match:
             course_code, title = match.groups()
             return title.strip()
@@ -387,9 +414,12 @@ class BulletproofTableParser:
         # If no pattern matches, return the whole string (might already be just title)
         return course_str.strip()
 
+    # Matching is per row against a set of targets, so their order doesn't affect the result
+    @cached_parse(key_targets=frozenset)
     def parse_schedule_bulletproof(self, html: str, target_semesters: List[str]) -> List[Dict]:
         """
         Main parsing function that uses pandas for bulletproof table extraction.
+        Results are reused when the same HTML is parsed again for the same semesters.
         
         Args:
             html: HTML content containing the table
@@ -398,7 +428,6 @@ class BulletproofTableParser:
         Returns:
             List of schedule item dictionaries for matching semesters only
         """
-        
         self.logger.info("🚀 BULLETPROOF PARSER STARTED 🚀")
         self.logger.info(f"Target semesters: {target_semesters}")
         
@@ -417,7 +446,7 @@ class BulletproofTableParser:
         
         # Process each table
         for i, table in enumerate(tables):
-            self.logger.info(f"Processing table {i+1} ({table.shape[0]} rows, {table.shape[1]} columns)")
+            self.logger.info("Processing table %d (%d rows, %d columns)", i + 1, table.shape[0], table.shape[1])
             
             # Filter by semesters
             filtered_table = self.filter_by_semesters(table, target_semesters)
@@ -425,7 +454,7 @@ class BulletproofTableParser:
             # Convert to schedule items
             items = self.dataframe_to_schedule_items(filtered_table)
             
-            self.logger.info(f"Table {i+1} produced {len(items)} matching items")
+            self.logger.info("Table %d produced %d matching items", i + 1, len(items))
             all_items.extend(items)
         
         self.logger.info(f"🎯 BULLETPROOF PARSER COMPLETE: {len(all_items)} total items")
@@ -51,28 +51,29 @@ def list_messages(service, user_id: str, query: str, max_results: int = 10) -> L
 def get_message(service, user_id: str, msg_id: str) -> Dict:
     return service.users().messages().get(userId=user_id, id=msg_id, format="full").execute()
 
-def _walk_parts_for_html(payload) -> Optional[str]:
-    if not payload:
-        return None
-
-    mime_type = payload.get("mimeType")
-    body = payload.get("body", {})
+_MULTIPART_TYPES = {"multipart/alternative", "multipart/mixed", "multipart/related"}
 
-    if mime_type == "text/html":
-        data = body.get("data")
-        if data:
-            return base64.urlsafe_b64decode(data.encode("utf-8")).decode("utf-8", errors="ignore")
+def _decode_body(data: str) -> str:
+    return base64.urlsafe_b64decode(data.encode("utf-8")).decode("utf-8", errors="ignore")
 
-    if mime_type in {"multipart/alternative", "multipart/mixed", "multipart/related"}:
-        for part in payload.get("parts", []) or []:
-            html = _walk_parts_for_html(part)
-            if html:
-                return html
+def _walk_parts_for_html(payload) -> Optional[str]:
+    """First non-empty text/html or text/plain body, depth-first in part order."""
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        if not part:
+            continue
 
-    if mime_type == "text/plain":
-        data = body.get("data")
-        if data:
-            return base64.urlsafe_b64decode(data.encode("utf-8")).decode("utf-8", errors="ignore")
+        mime_type = part.get("mimeType")
+        if mime_type in ("text/html", "text/plain"):
+            data = part.get("body", {}).get("data")
+            if data:
+                text = _decode_body(data)
+                if text:
+                    return text
+        elif mime_type in _MULTIPART_TYPES:
+            # Reversed so the first part is popped first
+            stack.extend(reversed(part.get("parts", []) or []))
 
     return None
 
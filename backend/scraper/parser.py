@@ -7,20 +7,62 @@ SZABIST schedule parser (tolerant).
 """
 
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
 import re
 from .config import settings
+from .utils import cached_parse
 from .semester_matcher import flexible_semester_match, normalize_semester, tokenize_semester, find_best_semester_match, find_all_matching_semesters
 
 WS = re.compile(r"\s+")
 NON_ALNUM = re.compile(r"[^A-Za-z0-9]+")
 
+# Patterns for the SZABIST line extractors, compiled once at import
+TIME_TAIL = re.compile(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$')
+CAMPUS_TAIL = re.compile(r'SZABIST\s+(?:University\s+Campus|HMB).*', re.IGNORECASE)
+CAMPUS_TAIL_END = re.compile(r'SZABIST\s+(?:University\s+Campus|HMB).*$', re.IGNORECASE)
+ROOM_WORD = re.compile(r'^\d{3}$|^Lab$|^NB-\d+$|^Hall$|^TV$|^Studio$|^TBD$|^Online$|^Cancelled$|^Canceled$', re.IGNORECASE)
+NAME_WORD = re.compile(r'^[A-Za-z][A-Za-z\'-]*$')
+ROOM_TAIL = re.compile(r'\b(?:Lab\s*\d+|Digital\s*Lab|\d{3}|NB-\d+|OB-\d+|Hall\s*\d+\s*[A-Z]?|TV\s*Studio|Media\s*Lab|TBD|Online|Cancelled|Canceled)\s*$', re.IGNORECASE)
+TRAILING_PUNCT = re.compile(r'[^\w\s]+$')
+ROOM_TOKEN = re.compile(r'\b(Digital\s*Lab|Lab\s*\d+|Hall\s*\d+\s*[A-Z]?|\d{3}|NB-\d+|OB-\d+|TV\s*Studio|TBD|Online)\b', re.IGNORECASE)
+CANCELLED_WORD = re.compile(r'\b(?:cancelled|canceled)\b', re.IGNORECASE)
+CREDITS = re.compile(r'\s*\([0-9,\.\s]+\)')
+TITLE_ROOM_TAIL = re.compile(r'\b(?:NB-\d+|Lab\s*\d+|Digital\s*Lab|\d{3}|Hall\s*\d+\s*[A-Z]?|TV\s*Studio|Media\s*Lab)\b.*$', re.IGNORECASE)
+TITLE_TRAILING_PUNCT = re.compile(r'[^\w\s:()-]+$')
+SZABIST_CAMPUS = re.compile(r'(SZABIST\s+University\s+Campus[^\n]*)', re.IGNORECASE)
+CAMPUS_CODE = re.compile(r'\b(H-\d+/\d+\s+ISB|H-\d+\s+ISB)\b')
+COURSE_CODE = re.compile(r'\b([A-Z]{2,4}\s*[A-Z]*\d{2,4})\b')  # Handle codes like 'CSC TE01'
+CREDIT_HOURS = re.compile(r'\((\d+[,\.]\d+)\)')
+
+# Words that end course titles in the SZABIST text format, so never start a faculty name
+COURSE_TITLE_WORDS = frozenset({
+    'design', 'and', 'architecture', 'systems', 'management', 'analysis', 'programming',
+    'fundamentals', 'engineering', 'development', 'theory', 'principles', 'structures',
+    'algorithms', 'networks', 'communications', 'databases', 'security', 'computing',
+    'science', 'mathematics', 'calculus', 'physics', 'chemistry', 'english', 'composition',
+    'comprehension', 'lab', 'laboratory', 'human', 'resource', 'business', 'process',
+    'interaction', 'interface', 'software', 'computer', 'data', 'information', 'technology',
+    'project', 'governance', 'monitoring', 'evaluation', 'organizational', 'cost',
+    'financial', 'risk', 'for', 'of', 'in', 'the', 'with', 'to'
+})
+HONORIFICS = frozenset({'dr', 'prof', 'mr', 'ms', 'mrs'})
+
+# Row starts of the plain-text format, used with .match() so no ^ is needed
+ROW_START = re.compile(r'(\d+)\s+')
+ROW_START_DEPT = re.compile(r'\d+\s+[A-Z]{2,4}\s+')
+ROW_START_BS_PROGRAM = re.compile(r'\d+\s+[A-Z]{2,4}\s+BS\([A-Z]{2,4}\)')
+
 def _ws(s: str) -> str:
     return WS.sub(" ", (s or "").strip())
 
 def _tok(s: str) -> str:
     return NON_ALNUM.sub("", (s or "").upper())
 
+def _cut_time_tail(s: str) -> str:
+    # Every time has a colon, so most fragments can skip the regex scan
+    return TIME_TAIL.sub('', s) if ':' in s else s
+
 def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
     """
     Parse plain text schedule content with enhanced data extraction.
@@ -45,7 +87,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
     # Also capture partial time patterns that might be continued on next lines
     partial_time_pattern = re.compile(r'\b(\d{1,2}:\d{2}(?:\s*(?:AM|PM))?)\b', re.IGNORECASE)
     room_pattern = re.compile(r'\b(\d{3}|Lab\s*\d+|Digital\s*Lab|TV\s*Studio|NB-\d+|OB-\d+|TBD|Online|Cancelled|Canceled)\b', re.IGNORECASE)
-    course_pattern = re.compile(r'\b([A-Z]{2,4}\s*[A-Z]*\d{2,4})\b')  # Handle codes like 'CSC TE01'
+    course_pattern = COURSE_CODE
     
     # Create a comprehensive mapping of all schedule data in the text
     # This helps us find missing time/campus data for incomplete entries
@@ -90,7 +132,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
     title_pattern = re.compile(r'\b[A-Z]{2,4}\s*\d{3,4}\s+([A-Z][A-Za-z\s&,-]+?)(?:\s*\([0-9,\.\s]+\)|\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s*$|$)')
     
     # Pattern for credit hours
-    credit_pattern = re.compile(r'\((\d+[,\.]\d+)\)')
+    credit_pattern = CREDIT_HOURS
     
     processed_lines = 0
     schedule_lines = []
@@ -194,7 +236,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
             if "course data on next line" in match_reason and i + 1 < len(schedule_lines):
                 next_line_num, next_line = schedule_lines[i + 1]
                 # Only combine if the next line doesn't start with a serial number (indicating a new entry)
-                if not re.match(r'^\d+\s+', next_line.strip()):
+                if not ROW_START.match(next_line.strip()):
                     combined_line = line + " " + next_line.strip()
                     course_match = course_pattern.search(combined_line)
                     # Skip the next line since we're consuming it
@@ -214,7 +256,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
                 has_campus = re.search(r'SZABIST', line, re.IGNORECASE)
                 
                 # Look ahead for continuation lines if missing important info or have incomplete time
-                incomplete_time = re.search(r'\d{1,2}:\d{2}\s*(?:AM|PM)\s*[-–—→]\s*$', combined_line, re.IGNORECASE)
+                incomplete_time = ':' in combined_line and re.search(r'\d{1,2}:\d{2}\s*(?:AM|PM)\s*[-–—→]\s*$', combined_line, re.IGNORECASE)
                 
                 # For BS(CS)-5B, be ultra aggressive since data often spans many lines
                 is_bs_cs_5b = 'BS(CS) - 5B' in combined_line
@@ -229,7 +271,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
                             logger.debug(f"  Checking continuation line {next_line_num}: '{next_line}'")
                         
                         # Stop if next line clearly starts a new entry 
-                        if (re.match(r'^\d+\s+', next_line) and 
+                        if (ROW_START.match(next_line) and 
                             (course_pattern.search(next_line) or 
                              re.search(r'\b(BS|MS|PhD|MBA|BBA)\s*\([^)]+\)', next_line))):
                             if settings.debug_parsing:
@@ -259,7 +301,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
                             re.search(r'\b\d+\b', next_line) or
                             # For BS(CS)-5B, be ULTRA AGGRESSIVE - collect almost any non-empty line
                             (is_bs_cs_5b and len(next_line.strip()) > 2 and 
-                             not re.match(r'^\d+\s+[A-Z]{2,4}\s+BS\([A-Z]{2,4}\)', next_line)) or
+                             not ROW_START_BS_PROGRAM.match(next_line)) or
                             # Lines that look like they have meaningful schedule data (longer than 3 chars with letters)
                             (len(next_line.strip()) > 3 and re.search(r'[A-Za-z]', next_line))):
                             if settings.debug_parsing:
@@ -269,7 +311,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
                         else:
                             # Don't break immediately - check if this could be a new course entry
                             if (len(next_line.strip()) > 0 and 
-                                re.match(r'^\d+\s+[A-Z]{2,4}\s+', next_line.strip())):
+                                ROW_START_DEPT.match(next_line.strip())):
                                 # This looks like a new course entry (starts with number and dept)
                                 if settings.debug_parsing:
                                     logger.debug(f"  Breaking: next line looks like new course entry")
@@ -306,7 +348,7 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
             course_match = course_pattern.search(combined_line)
             campus_match = re.search(r'(SZABIST\s+(?:University\s+Campus|HMB)[^\n]*)', combined_line, re.IGNORECASE)
             credit_match = credit_pattern.search(combined_line)
-            sr_match = re.match(r'^(\d+)\s+', combined_line)
+            sr_match = ROW_START.match(combined_line)
             dept_match = re.search(r'\b(CS|SE|EE|CE|IT|BBA|MBA|Media)\b', combined_line)
             
             # Extract course first since we need it for time reconstruction
@@ -341,14 +383,8 @@ def parse_schedule_text(text: str, semesters: List[str]) -> List[Dict]:
                     if extracted_course == 'CSC 2205':
                         extracted_time = "03:30 PM - 05:00 PM"  # Known CSC 2205 time
             
-            # Try to extract faculty name more intelligently  
-            faculty_name = _extract_faculty_szabist(combined_line, course_match, credit_match)
-            
-            # Extract course title more accurately
-            course_title = _extract_course_title_szabist(combined_line, course_match, faculty_name)
-            
-            # Extract room with special handling for "Digital Lab"
-            extracted_room = _extract_room_szabist(combined_line, faculty_name, course_match, credit_match)
+            # Faculty, course title and room (with special handling for "Digital Lab")
+            faculty_name, course_title, extracted_room = _extract_szabist_fields(combined_line)
             
             # Handle missing room data for specific courses
             if not extracted_room and extracted_course == 'CSC 2205':
@@ -490,7 +526,9 @@ def _find_header_row(trs) -> Optional[int]:
             return i
     return None
 
+@cached_parse(key_targets=tuple)
 def parse_schedule_html(html: str, semesters: List[str]) -> List[Dict]:
+    """Parse a schedule email, reusing the result when the same HTML is parsed for the same semesters"""
     import logging
     logger = logging.getLogger(__name__)
     
@@ -580,7 +618,7 @@ def parse_schedule_html(html: str, semesters: List[str]) -> List[Dict]:
         logger.debug(f"Row {processed_rows}: class_section='{class_section}', tokenized='{class_tok}'")
         
         # Enhanced debug for PhD Psychology -2 specifically
-        if "PhD Psychology" in class_section or any("PhD Psychology" in str(cell) for cell in cells):
+        if "PhD Psychology" in class_section or any("PhD Psychology" in cell for cell in cells):
             logger.info(f"DEBUG PhD Psychology row {processed_rows}: full cells = {cells}")
             logger.info(f"DEBUG PhD Psychology row {processed_rows}: colmap = {colmap}")
             logger.info(f"DEBUG PhD Psychology row {processed_rows}: course='{pick('course')}', faculty='{pick('faculty')}', room='{pick('room')}'")
@@ -628,7 +666,7 @@ def parse_schedule_html(html: str, semesters: List[str]) -> List[Dict]:
 
         # Check if class is cancelled
         room_text = pick("room")
-        is_cancelled = room_text and re.search(r'\b(?:cancelled|canceled)\b', room_text, re.IGNORECASE) is not None
+        is_cancelled = room_text and CANCELLED_WORD.search(room_text) is not None
         
         # Debug: Log the faculty field for SEC 2404
         faculty_raw = pick("faculty")
@@ -643,9 +681,9 @@ def parse_schedule_html(html: str, semesters: List[str]) -> List[Dict]:
             "dept": pick("dept"),
             "program": pick("program"),
             "class_section": class_section,
-            "course": pick("course"),
-            "faculty": _map_faculty_name(pick("faculty")),
-            "room": "Cancelled" if is_cancelled else pick("room"),
+            "course": course_raw,
+            "faculty": _map_faculty_name(faculty_raw),
+            "room": "Cancelled" if is_cancelled else room_text,
             "time": pick("time"),
             "campus": pick("campus"),
             "is_cancelled": is_cancelled,
@@ -702,6 +740,16 @@ def _extract_faculty(line: str) -> Optional[str]:
     
     return None
 
+@lru_cache(maxsize=4096)
+def _extract_szabist_fields(line: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Faculty, course title and room of a SZABIST text row - the same rows recur across re-sent emails"""
+    course_match = COURSE_CODE.search(line)
+    credit_match = CREDIT_HOURS.search(line)
+    faculty_name = _extract_faculty_szabist(line, course_match, credit_match)
+    course_title = _extract_course_title_szabist(line, course_match, faculty_name)
+    room = _extract_room_szabist(line, faculty_name, course_match, credit_match)
+    return faculty_name, course_title, room
+
 def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[str]:
     """Extract faculty name specifically for SZABIST format"""
     # In SZABIST format, faculty typically comes after course title and credits
@@ -722,10 +770,10 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
         after_credits = line[credit_match.end():].strip()
         
         # Remove time patterns and everything after them
-        cleaned = re.sub(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$', '', after_credits).strip()
+        cleaned = _cut_time_tail(after_credits).strip()
         
         # Remove campus patterns
-        cleaned = re.sub(r'SZABIST\s+(?:University\s+Campus|HMB).*', '', cleaned, flags=re.IGNORECASE).strip()
+        cleaned = CAMPUS_TAIL.sub('', cleaned).strip()
         
         # Parse words to find faculty name
         words = cleaned.split()
@@ -737,7 +785,7 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
             
             # Check for room patterns that should stop faculty collection
             # But handle "Digital Lab" carefully - it could be room or part of name
-            if re.match(r'^\d{3}$|^Lab$|^NB-\d+$|^Hall$|^TV$|^Studio$|^TBD$|^Online$|^Cancelled$|^Canceled$', word, re.IGNORECASE):
+            if ROOM_WORD.match(word):
                 if word.lower() == 'lab' and i > 0:
                     # Check if previous word is "Digital" which would make "Digital Lab" a room
                     if words[i-1].lower() == 'digital':
@@ -760,7 +808,7 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
                 if word.lower() in ['dr', 'dr.', 'prof', 'prof.', 'mr', 'mr.', 'ms', 'ms.']:
                     faculty_words.append(word)
                 # Allow words with some non-alphabetic characters for names like "O'Brien"
-                elif re.match(r'^[A-Za-z][A-Za-z\'-]*$', word):
+                elif NAME_WORD.match(word):
                     faculty_words.append(word)
                 elif word.replace('-', '').replace("'", "").isalpha():
                     faculty_words.append(word)
@@ -783,32 +831,21 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
         # Pattern: [Course Code] [Course Title] [Faculty] [Room] [Time] [Campus]
         
         # Remove time and campus from the end first
-        cleaned = re.sub(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$', '', after_course).strip()
-        cleaned = re.sub(r'SZABIST\s+(?:University\s+Campus|HMB).*$', '', cleaned, flags=re.IGNORECASE).strip()
+        cleaned = _cut_time_tail(after_course).strip()
+        cleaned = CAMPUS_TAIL_END.sub('', cleaned).strip()
         
         # Remove room patterns from the end to isolate title and faculty
         # This handles cases like "Lab 01", "Digital Lab", "301", "NB-208", "Hall 01 A", "TBD", "Online", "Cancelled", etc.
-        cleaned = re.sub(r'\b(?:Lab\s*\d+|Digital\s*Lab|\d{3}|NB-\d+|OB-\d+|Hall\s*\d+\s*[A-Z]?|TV\s*Studio|Media\s*Lab|TBD|Online|Cancelled|Canceled)\s*$', '', cleaned, flags=re.IGNORECASE).strip()
+        cleaned = ROOM_TAIL.sub('', cleaned).strip()
         
         # Remove trailing punctuation and clean up the text
-        cleaned = re.sub(r'[^\w\s]+$', '', cleaned).strip()
+        cleaned = TRAILING_PUNCT.sub('', cleaned).strip()
         
         # Now we should have: [Course Title] [Faculty Name]
         # Strategy: Look for common course title patterns and faculty name patterns
         words = cleaned.split()
         
         if len(words) >= 2:
-            # Common course title ending words that indicate title continuation
-            title_words = {'design', 'and', 'architecture', 'systems', 'management', 'analysis', 
-                          'programming', 'fundamentals', 'engineering', 'development', 'theory',
-                          'principles', 'structures', 'algorithms', 'networks', 'communications',
-                          'databases', 'security', 'computing', 'science', 'mathematics', 'calculus',
-                          'physics', 'chemistry', 'english', 'composition', 'comprehension', 'lab',
-                          'laboratory', 'human', 'resource', 'business', 'process', 'interaction',
-                          'interface', 'software', 'computer', 'data', 'information', 'technology',
-                          'project', 'governance', 'monitoring', 'evaluation', 'organizational',
-                          'cost', 'financial', 'risk', 'for', 'of', 'in', 'the', 'with', 'to'}
-            
             # Find where the title likely ends and faculty begins
             # Look for the first sequence of capitalized words that aren't title words
             faculty_start_idx = -1
@@ -822,23 +859,21 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
                 clean_words = []
                 for word in candidate_faculty:
                     clean_word = word.rstrip('.,')  # Remove trailing punctuation
-                    if (clean_word.isalpha() or 
-                        clean_word.lower() in ['dr.', 'prof.', 'mr.', 'ms.', 'mrs.'] or
-                        clean_word.rstrip('.').lower() in ['dr', 'prof', 'mr', 'ms', 'mrs']):
+                    if clean_word.isalpha() or clean_word.rstrip('.').lower() in HONORIFICS:
                         clean_words.append(clean_word)
                 
                 if not clean_words:
                     continue
                 
                 # Check if any word is a title word (course-related)
-                has_title_words = any(word.lower() in title_words for word in clean_words)
+                has_title_words = not COURSE_TITLE_WORDS.isdisjoint(word.lower() for word in clean_words)
                 
                 if not has_title_words:
                     # Check if words look like names
                     looks_like_names = True
                     for i, word in enumerate(clean_words):
                         word_lower = word.rstrip('.').lower()
-                        if word_lower in ['dr', 'prof', 'mr', 'ms', 'mrs']:
+                        if word_lower in HONORIFICS:
                             continue  # Titles are fine
                         elif word[0].isupper():
                             continue  # Proper nouns are fine  
@@ -857,9 +892,7 @@ def _extract_faculty_szabist(line: str, course_match, credit_match) -> Optional[
                 # Include titles and alphabetic words for the final result
                 final_faculty = []
                 for word in faculty_words:
-                    if (word.isalpha() or 
-                        word.lower() in ['dr.', 'prof.', 'mr.', 'ms.', 'mrs.'] or
-                        word.rstrip('.').lower() in ['dr', 'prof', 'mr', 'ms', 'mrs']):
+                    if word.isalpha() or word.rstrip('.').lower() in HONORIFICS:
                         final_faculty.append(word)
                 
                 if final_faculty:
@@ -873,7 +906,7 @@ def _extract_room_szabist(line: str, faculty_name: str, course_match, credit_mat
         return None
     
     # Check for cancellation patterns first
-    if re.search(r'\b(?:cancelled|canceled)\b', line, re.IGNORECASE):
+    if CANCELLED_WORD.search(line):
         return "Cancelled"
     
     # For line: "36 AI BSAI BSAI - 4B CSCL 2203 Lab: Database Systems (0,1) Anees Tariq Digital Lab 02:00 PM – 05:00 PM SZABIST University Campus"
@@ -887,8 +920,8 @@ def _extract_room_szabist(line: str, faculty_name: str, course_match, credit_mat
         search_area = line[course_match.end():].strip()
     
     # Remove time and campus from the end to focus on the middle part
-    search_area = re.sub(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$', '', search_area).strip()
-    search_area = re.sub(r'SZABIST\s+(?:University\s+Campus|HMB).*$', '', search_area, flags=re.IGNORECASE).strip()
+    search_area = _cut_time_tail(search_area).strip()
+    search_area = CAMPUS_TAIL_END.sub('', search_area).strip()
     
     # If we have faculty name, remove it from the search area to isolate the room
     if faculty_name:
@@ -899,7 +932,7 @@ def _extract_room_szabist(line: str, faculty_name: str, course_match, credit_mat
         if len(parts) > 1:
             after_faculty = parts[1].strip()
             # Look for room patterns in what comes after faculty - updated to include Hall patterns
-            room_match = re.search(r'\b(Digital\s*Lab|Lab\s*\d+|Hall\s*\d+\s*[A-Z]?|\d{3}|NB-\d+|OB-\d+|TV\s*Studio|TBD|Online)\b', after_faculty, re.IGNORECASE)
+            room_match = ROOM_TOKEN.search(after_faculty)
             if room_match:
                 room = room_match.group(1)
                 # Keep TBD as TBD since that's the actual room status
@@ -907,7 +940,7 @@ def _extract_room_szabist(line: str, faculty_name: str, course_match, credit_mat
     
     # Fallback: look for any room pattern in the search area
     # Updated pattern to include Hall patterns like "Hall 01 A"
-    room_match = re.search(r'\b(Digital\s*Lab|Lab\s*\d+|Hall\s*\d+\s*[A-Z]?|\d{3}|NB-\d+|OB-\d+|TV\s*Studio|TBD|Online)\b', search_area, re.IGNORECASE)
+    room_match = ROOM_TOKEN.search(search_area)
     if room_match:
         room = room_match.group(1)
         # Convert TBD to Online for consistency
@@ -927,16 +960,16 @@ def _extract_course_title_szabist(line: str, course_match, faculty_name: str) ->
     title_part = after_course
     
     # Remove credits pattern if present
-    credits_match = re.search(r'\s*\([0-9,\.\s]+\)', title_part)
+    credits_match = CREDITS.search(title_part) if '(' in title_part else None
     if credits_match:
         title_part = title_part[:credits_match.start()]
     else:
         # No credits found - need to be more careful about where title ends
         # First remove time, room, and campus patterns to isolate title and faculty
         temp_part = title_part
-        temp_part = re.sub(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$', '', temp_part)
-        temp_part = re.sub(r'SZABIST\s+(?:University\s+Campus|HMB).*$', '', temp_part, flags=re.IGNORECASE)
-        temp_part = re.sub(r'\b(?:NB-\d+|Lab\s*\d+|Digital\s*Lab|\d{3}|Hall\s*\d+\s*[A-Z]?|TV\s*Studio|Media\s*Lab)\b.*$', '', temp_part, flags=re.IGNORECASE)
+        temp_part = _cut_time_tail(temp_part)
+        temp_part = CAMPUS_TAIL_END.sub('', temp_part)
+        temp_part = TITLE_ROOM_TAIL.sub('', temp_part)
         
         # If we have faculty name, try to find where title ends and faculty begins
         if faculty_name:
@@ -958,15 +991,15 @@ def _extract_course_title_szabist(line: str, course_match, faculty_name: str) ->
             title_part = temp_part.strip()
     
     # Final cleanup - remove time, room, and campus patterns again in case they weren't caught
-    title_part = re.sub(r'\d{1,2}:\d{2}\s*(?:AM|PM).*$', '', title_part)
-    title_part = re.sub(r'\b(?:NB-\d+|Lab\s*\d+|Digital\s*Lab|\d{3}|Hall\s*\d+\s*[A-Z]?|TV\s*Studio|Media\s*Lab)\b.*$', '', title_part, flags=re.IGNORECASE)
-    title_part = re.sub(r'SZABIST\s+(?:University\s+Campus|HMB).*$', '', title_part, flags=re.IGNORECASE)
+    title_part = _cut_time_tail(title_part)
+    title_part = TITLE_ROOM_TAIL.sub('', title_part)
+    title_part = CAMPUS_TAIL_END.sub('', title_part)
     
     # Clean up the title
     title_part = title_part.strip()
     
     # Remove trailing non-alphabetic characters except colons (for "Lab:" prefixes)
-    title_part = re.sub(r'[^\w\s:()-]+$', '', title_part).strip()
+    title_part = TITLE_TRAILING_PUNCT.sub('', title_part).strip()
     
     if title_part and len(title_part) > 2:
         return title_part
@@ -976,15 +1009,15 @@ def _extract_course_title_szabist(line: str, course_match, faculty_name: str) ->
 def _extract_campus_szabist(line: str) -> Optional[str]:
     """Extract campus information specifically for SZABIST format"""
     # Look for SZABIST University Campus pattern
-    campus_match = re.search(r'(SZABIST\s+University\s+Campus[^\n]*)', line, re.IGNORECASE)
+    campus_match = SZABIST_CAMPUS.search(line)
     if campus_match:
         campus_info = campus_match.group(1).strip()
         # Clean up extra text
-        campus_info = re.sub(r'\s+', ' ', campus_info)
+        campus_info = WS.sub(' ', campus_info)
         return campus_info
     
     # Look for campus codes like "H-8/4 ISB"
-    campus_code = re.search(r'\b(H-\d+/\d+\s+ISB|H-\d+\s+ISB)\b', line)
+    campus_code = CAMPUS_CODE.search(line) if 'ISB' in line else None
     if campus_code:
         return f"SZABIST University Campus {campus_code.group(1)}"
     
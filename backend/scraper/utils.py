@@ -0,0 +1,70 @@
+"""
+Helpers shared by the schedule parsers.
+"""
+import copy
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# The scheduler re-reads the same schedule email on every run and for every user,
+# so each parser keeps its most recent results per (content digest, targets)
+PARSE_CACHE_SIZE = 32
+
+def cached_parse(key_targets=tuple, maxsize: int = PARSE_CACHE_SIZE):
+    """
+    Cache a parse function whose last two parameters are the HTML and the target semesters.
+
+    The key is the HTML's content digest plus key_targets(targets) - tuple where the target
+    order affects the result, frozenset where it doesn't. Results are deep-copied in and out
+    so callers can't mutate a cached parse. Empty results are not cached, since they may be
+    a parse failure that should be retried.
+    """
+    def decorator(parse):
+        signature = inspect.signature(parse)
+        html_param, targets_param = list(signature.parameters)[-2:]
+        logger = logging.getLogger(parse.__module__)
+        cache = OrderedDict()
+        lock = threading.Lock()
+        stats = {'hits': 0, 'misses': 0}
+
+        @wraps(parse)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            html = bound.arguments[html_param] or ""
+            key = (hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+                   key_targets(bound.arguments[targets_param] or ()))
+
+            with lock:
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+                    stats['hits'] += 1
+                else:
+                    stats['misses'] += 1
+                hits, misses = stats['hits'], stats['misses']
+
+            if cached is not None:
+                logger.info(f"♻️ Reusing {parse.__qualname__} result for identical content "
+                            f"({hits} hits, {misses} misses)")
+                return copy.deepcopy(cached)
+
+            items = parse(*args, **kwargs)
+
+            if items:
+                with lock:
+                    cache[key] = copy.deepcopy(items)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return items
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -0,0 +1,146 @@
+"""
+Tests for the shared parse result cache
+"""
+import pytest
+
+import sys
+import os
+# Add the backend directory to Python path (parent of tests)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper.utils import cached_parse
+from scraper.advanced_table_parser import AdvancedTableParser
+from scraper.bulletproof_parser import BulletproofTableParser
+from scraper.parser import parse_schedule_html
+
+HEADERS = ["Sr No", "Dept", "Program", "Class/Section", "Course", "Faculty", "Room", "Time", "Campus"]
+ROWS = [
+    ["1", "CS", "BS(CS)", "BS(CS) - 5B", "CSC 2123 Theory of Automata (3,0)", "Dr. Aqeel Ahmed", "301",
+     "02:00 PM - 03:30 PM", "SZABIST University Campus"],
+    ["2", "CS", "BS(SE)", "BS(SE) - 5C", "SEC 2404 Software Design", "Saboor", "302",
+     "03:30 PM - 05:00 PM", "SZABIST University Campus"],
+    ["3", "AI", "BSAI", "BS(AI) - 3A", "CSCL 3105 Lab: COAL (0,1)", "Sarwat Nadeem", "Lab 05",
+     "08:00 AM - 11:00 AM", "SZABIST University Campus"],
+]
+SCHEDULE_HTML = (
+    "<html><body><table border='1'><tr>" + "".join(f"<th>{h}</th>" for h in HEADERS) + "</tr>"
+    + "".join("<tr>" + "".join(f"<td>{c}</td>" for c in row) + "</tr>" for row in ROWS)
+    + "</table></body></html>"
+)
+
+def _assert_cached_copy(parse):
+    """A repeat parse returns an equal result that is not shared with the cache"""
+    first = parse()
+    assert first
+
+    second = parse()
+    assert second == first
+    assert second is not first
+
+    # Mutating a returned result must not leak into the next hit
+    expected = parse()
+    second[0]['course'] = 'MUTATED'
+    second.append({'course': 'EXTRA'})
+    assert parse() == expected
+
+class TestCachedParse:
+    """Test the cached_parse decorator"""
+
+    def test_hit_skips_parse(self):
+        """Test a repeated (html, targets) pair is parsed once"""
+        calls = []
+
+        @cached_parse()
+        def parse(html, targets):
+            calls.append(html)
+            return [{'html': html, 'cells': [1, 2]}]
+
+        assert parse('<table>', ['A']) == parse('<table>', ['A'])
+        assert len(calls) == 1
+
+        parse('<table>', ['B'])
+        parse('<table2>', ['A'])
+        assert len(calls) == 3
+
+    def test_hit_is_deep_copy(self):
+        """Test nested values of a hit can be changed without touching the cache"""
+        @cached_parse()
+        def parse(html, targets):
+            return [{'html': html, 'cells': [1, 2]}]
+
+        parse('<table>', None)[0]['cells'].append(3)
+        assert parse('<table>', None) == [{'html': '<table>', 'cells': [1, 2]}]
+
+    def test_empty_results_not_cached(self):
+        """Test an empty result is parsed again next time"""
+        calls = []
+
+        @cached_parse()
+        def parse(html, targets):
+            calls.append(html)
+            return []
+
+        parse('<table>', None)
+        parse('<table>', None)
+        assert len(calls) == 2
+
+    def test_target_key(self):
+        """Test frozenset keys ignore target order and tuple keys don't"""
+        calls = []
+
+        @cached_parse(key_targets=frozenset)
+        def unordered(html, targets):
+            calls.append(targets)
+            return [{'html': html}]
+
+        unordered('<table>', ['A', 'B'])
+        unordered('<table>', ['B', 'A'])
+        assert len(calls) == 1
+
+        @cached_parse(key_targets=tuple)
+        def ordered(html, targets):
+            calls.append(targets)
+            return [{'html': html}]
+
+        ordered('<table>', ['A', 'B'])
+        ordered('<table>', ['B', 'A'])
+        assert len(calls) == 3
+
+    def test_eviction(self):
+        """Test the least recently used entry is dropped past maxsize"""
+        calls = []
+
+        @cached_parse(maxsize=2)
+        def parse(html, targets):
+            calls.append(html)
+            return [{'html': html}]
+
+        parse('a', None)
+        parse('b', None)
+        parse('a', None)  # refresh 'a'
+        parse('c', None)  # evicts 'b'
+        parse('a', None)
+        assert calls == ['a', 'b', 'c']
+        parse('b', None)
+        assert calls == ['a', 'b', 'c', 'b']
+
+class TestParserCaches:
+    """Test each parser returns isolated copies of cached results"""
+
+    def test_advanced_parser(self):
+        """Test the advanced pandas parser cache"""
+        AdvancedTableParser.parse_timetable.cache_clear()
+        _assert_cached_copy(lambda: AdvancedTableParser().parse_timetable(SCHEDULE_HTML, ["BS(CS) - 5B"]))
+
+    def test_bulletproof_parser(self):
+        """Test the bulletproof parser cache"""
+        BulletproofTableParser.parse_schedule_bulletproof.cache_clear()
+        _assert_cached_copy(lambda: BulletproofTableParser().parse_schedule_bulletproof(SCHEDULE_HTML, ["BS(CS)-5B"]))
+
+    def test_text_parser(self):
+        """Test the BeautifulSoup text parser cache"""
+        parse_schedule_html.cache_clear()
+        _assert_cached_copy(lambda: parse_schedule_html(SCHEDULE_HTML, ["BS(CS) - 5B"]))
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
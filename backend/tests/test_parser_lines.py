@@ -0,0 +1,76 @@
+"""
+Tests for the advanced parser's schedule line parsing
+"""
+import numpy as np
+import pytest
+
+import sys
+import os
+# Add the backend directory to Python path (parent of tests)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from scraper.advanced_table_parser import AdvancedTableParser, PARSED_ENTRY_FIELDS, _parse_schedule_line
+
+NORMAL_LINE = ("6 CS BS (CS) BS (CS) - 5B CSC 2123 Theory of Automata (3,0) Dr. Aqeel Ahmed 301 "
+               "02:00 PM - 03:30 PM SZABIST University Campus")
+CANCELLED_LINE = "7 CS BS (CS) BS (CS) - 5B CSC 2205 Operating Systems (3,0) Awais Mehmood Cancelled"
+HALL_LINE = ("4 MS MS (PM) MS (PM) - 1 A Core PM TE03 Project Risk Management (3,0) Dr. Muhammad Shoaib "
+             "Hall 01 A 06:00 PM - 09:00 PM SZABIST University Campus H-8/4 ISB")
+
+class TestParseScheduleLine:
+    """Test _parse_schedule_line outputs"""
+
+    def test_fields_order(self):
+        """Test the tuple field order"""
+        assert PARSED_ENTRY_FIELDS == ('sr_no', 'dept', 'program', 'semester', 'course', 'course_title',
+                                       'faculty', 'room', 'time', 'campus', 'raw_line')
+
+    def test_normal_line(self):
+        """Test a complete schedule line"""
+        assert _parse_schedule_line(NORMAL_LINE) == (
+            '6', 'CS', 'BS', 'BS (CS) - 5B', 'CSC 2123', 'Theory of Automata', 'Dr. Aqeel Ahmed',
+            '301', '02:00 PM - 03:30 PM', 'SZABIST University Campus', NORMAL_LINE[:100] + '...',
+        )
+
+    def test_cancelled_line(self):
+        """Test a cancelled class keeps its faculty and marks the rest cancelled"""
+        assert _parse_schedule_line(CANCELLED_LINE) == (
+            '7', 'CS', 'BS', 'BS (CS) - 5B', 'CSC 2205', 'Operating Systems', 'Awais Mehmood',
+            'CANCELLED', 'CANCELLED', 'CANCELLED', CANCELLED_LINE,
+        )
+
+    def test_hall_room_line(self):
+        """Test a "Hall 01 A" room and a campus with a location code"""
+        assert _parse_schedule_line(HALL_LINE) == (
+            '4', 'MS', 'MS', 'MS (PM) - 1', 'PM TE03', 'Project Risk Management', 'Dr. Muhammad Shoaib',
+            'Hall 01 A', '06:00 PM - 09:00 PM', 'SZABIST University Campus H-8/4 ISB', HALL_LINE[:100] + '...',
+        )
+
+    def test_line_without_course_or_semester(self):
+        """Test lines without a course and semester are dropped"""
+        assert _parse_schedule_line("Dear Students, please find the schedule below") is None
+
+    def test_method_returns_dict(self):
+        """Test the parser method wraps the tuple in a dict"""
+        parsed = AdvancedTableParser()._parse_schedule_line(NORMAL_LINE)
+        assert parsed == dict(zip(PARSED_ENTRY_FIELDS, _parse_schedule_line(NORMAL_LINE)))
+
+class TestCleanFields:
+    """Test column-wise cleaning of extracted fields"""
+
+    def test_numbered_room_default_campus(self):
+        """Test three-digit rooms get the default campus, including non-ASCII digits"""
+        parser = AdvancedTableParser()
+        rooms = ['301', '١٠٢', '３０１', 'Lab 02']
+        fields = {field: np.array([None] * len(rooms), dtype=object) for field in parser.EXTRACT_COLUMNS}
+        fields['course'] = np.array(['CSC 2123'] * len(rooms), dtype=object)
+        fields['semester'] = np.array(['BS(CS) - 5B'] * len(rooms), dtype=object)
+        fields['room'] = np.array(rooms, dtype=object)
+
+        records = parser._extract_all_records(fields)
+
+        assert [record['room'] for record in records] == rooms
+        assert [record['campus'] for record in records] == ['SZABIST University Campus'] * 3 + [None]
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
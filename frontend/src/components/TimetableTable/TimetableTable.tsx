@@ -12,6 +12,10 @@ interface TimetableTableProps {
   items: TimetableItem[];
 }
 
+// Debug logging is development-only - the production build strips these branches,
+// so rendering no longer formats log lines or recomputes display values just to log them
+const DEBUG_LOGS = process.env.NODE_ENV === 'development';
+
 // Debug logging cache to reduce console spam
 let loggedTimes = new Set<string>();
 let loggedSemesters = new Set<string>();
@@ -39,7 +43,7 @@ const parseTimeToMinutes = (timeStr: string): number => {
   const totalMinutes = hours * 60 + minutes;
   
   // Reduce debug logging frequency - only log unique time strings
-  if (!loggedTimes.has(timeStr)) {
+  if (DEBUG_LOGS && !loggedTimes.has(timeStr)) {
     loggedTimes.add(timeStr);
     console.log(`Time parsing: "${timeStr}" -> ${hours}:${minutes.toString().padStart(2, '0')} (${totalMinutes} minutes)`);
   }
@@ -165,11 +169,15 @@ const groupAndSortData = (items: TimetableItem[]) => {
     return acc;
   }, {} as Record<string, TimetableItem[]>);
 
+  // Resolve each item's display time once, not on every comparison the sort makes
+  const startMinutes = new Map<TimetableItem, number>();
+  items.forEach(item => startMinutes.set(item, parseTimeToMinutes(getDisplayTime(item))));
+
   // Sort each group by time with better error handling
   Object.keys(grouped).forEach(semester => {
     grouped[semester].sort((a, b) => {
-      const timeA = parseTimeToMinutes(getDisplayTime(a));
-      const timeB = parseTimeToMinutes(getDisplayTime(b));
+      const timeA = startMinutes.get(a)!;
+      const timeB = startMinutes.get(b)!;
       
       // If times are equal, sort by course code as secondary criteria
       if (timeA === timeB) {
@@ -182,7 +190,7 @@ const groupAndSortData = (items: TimetableItem[]) => {
     });
     
     // Debug: Log the sorted order for this semester (only once per render)
-    if (!loggedSemesters.has(semester)) {
+    if (DEBUG_LOGS && !loggedSemesters.has(semester)) {
       loggedSemesters.add(semester);
       console.log(`Semester "${semester}" sorted order:`);
       grouped[semester].forEach((item, index) => {
@@ -204,6 +212,7 @@ const TimetableTable: React.FC<TimetableTableProps> = ({ items }) => {
 
   // Debug: Log raw data for CSCL courses
   React.useEffect(() => {
+    if (!DEBUG_LOGS) return;
     items.forEach((item, index) => {
       if (item.course && item.course.includes('CSCL')) {
         console.log(`DEBUG ${item.course}:`, {
@@ -86,32 +86,68 @@ export const DEPARTMENT_NAMES: Record<string, string> = {
   'IT': 'Information Technology'
 };
 
+/**
+ * Regex tables used by the helpers below, built once at module load
+ * instead of on every call (none use the g flag, so they keep no state)
+ */
+
+// Room extraction patterns (ordered by specificity)
+const ROOM_EXTRACTION_PATTERNS: RegExp[] = [
+  /\b(Lab\s+\d+)\b/i,                    // Lab 02, Lab 05
+  /\b(Digital\s+Lab)\b/i,                // Digital Lab  
+  /\b(Computer\s+Lab)\b/i,               // Computer Lab
+  /\b(Room\s+\d+)\b/i,                   // Room 302
+  /\b([A-Z]{2}-\d+)\b/i,                 // NB-01, OB-05
+  /\b(\d{3})\b/,                         // 302, 401 (room numbers)
+  /\b(TBD)\b/i,                          // TBD rooms (treat as online)
+  /\b(Online|Virtual)\b/i,               // Online classes
+  /\b(Cancelled|Canceled)\b/i,           // Cancelled classes
+  /\b(Lab\s+\w+)\b/i                     // Other lab variations
+];
+
+// Room patterns for generateRoomFallback
+const ROOM_FALLBACK_PATTERNS: RegExp[] = [
+  /\b(Lab\s+\d+)\b/i,          // Lab 02, Lab 05
+  /\b(Digital\s+Lab)\b/i,      // Digital Lab
+  /\b(Computer\s+Lab)\b/i,     // Computer Lab
+  /\b(\d{3})\b/,               // Room numbers like 302
+  /\b(NB-\d+|OB-\d+)\b/i,     // Building codes
+  /\b(TBD)\b/i,                // TBD rooms (treat as online)
+  /\b(Lab\s+\w+)\b/i           // Other lab variations
+];
+
+// Department prefix and number of a course code, e.g. "CSCL 3105"
+const COURSE_CODE_PATTERN = /([A-Z]+)\s*(\d+)/;
+const CAMPUS_PATTERN_ENTRIES = Object.entries(PATTERN_CORRECTIONS.CAMPUS_PATTERNS);
+
+const rawTextCache = new WeakMap<TimetableItem, string>();
+
+/**
+ * Raw text of an item: full_text, else the joined raw_cells. The join is
+ * done at most once per item, since display falls through several helpers
+ */
+const rawTextOf = (item: TimetableItem): string => {
+  const fullText = (item as any).full_text;
+  if (fullText) return fullText;
+
+  let joined = rawTextCache.get(item);
+  if (joined === undefined) {
+    joined = (item as any).raw_cells?.join(' ') || '';
+    rawTextCache.set(item, joined);
+  }
+  return joined;
+};
+
 /**
  * Extract room information from raw text data
  */
 export const extractRoomFromRawData = (item: TimetableItem): string | null => {
   // Check if item has raw data fields
-  const rawText = (item as any).full_text || 
-                  (item as any).raw_cells?.join(' ') || 
-                  '';
+  const rawText = rawTextOf(item);
   
   if (!rawText) return null;
   
-  // Room extraction patterns (ordered by specificity)
-  const roomPatterns = [
-    /\b(Lab\s+\d+)\b/i,                    // Lab 02, Lab 05
-    /\b(Digital\s+Lab)\b/i,                // Digital Lab  
-    /\b(Computer\s+Lab)\b/i,               // Computer Lab
-    /\b(Room\s+\d+)\b/i,                   // Room 302
-    /\b([A-Z]{2}-\d+)\b/i,                 // NB-01, OB-05
-    /\b(\d{3})\b/,                         // 302, 401 (room numbers)
-    /\b(TBD)\b/i,                          // TBD rooms (treat as online)
-    /\b(Online|Virtual)\b/i,               // Online classes
-    /\b(Cancelled|Canceled)\b/i,           // Cancelled classes
-    /\b(Lab\s+\w+)\b/i                     // Other lab variations
-  ];
-  
-  for (const pattern of roomPatterns) {
+  for (const pattern of ROOM_EXTRACTION_PATTERNS) {
     const match = rawText.match(pattern);
     if (match) {
       const room = match[1];
@@ -127,17 +163,11 @@ export const extractRoomFromRawData = (item: TimetableItem): string | null => {
  * Validation functions
  */
 export const isValidData = (value: any): boolean => {
-  if (!value) return false;
-  if (value === 'null' || value === 'undefined') return false;
-  if (typeof value !== 'string') return false;
+  // Non-strings and serialized null/undefined are never data; an empty string trims to ''
+  if (typeof value !== 'string' || value === 'null' || value === 'undefined') return false;
   
-  const trimmed = value.trim();
-  if (trimmed === '') return false;
-  
-  // Special case: "-" is considered valid data (it means "no room" or "TBD")
-  if (trimmed === '-') return true;
-  
-  return true;
+  // Note: "-" is considered valid data (it means "no room" or "TBD")
+  return value.trim() !== '';
 };
 
 /**
@@ -169,7 +199,9 @@ export const getCorrectedValue = (field: keyof CourseCorrection, item: Timetable
     case 'time':
       return generateTimeFallback(item);
     case 'room':
-      return generateRoomFallback(item);
+      // extractRoomFromRawData above already tried a superset of generateRoomFallback's
+      // raw-text patterns, so scanning the raw text again could never match
+      return roomFallbackFromCourse(item);
     case 'campus':
       return generateCampusFallback(item);
     case 'faculty':
@@ -179,14 +211,29 @@ export const getCorrectedValue = (field: keyof CourseCorrection, item: Timetable
   }
 };
 
+// Course strings come from schedule emails, so cap the cache rather than let it grow forever
+const COURSE_TITLE_CACHE_LIMIT = 500;
+const courseTitleCache = new Map<string, string>();
+
 /**
  * Generate a reasonable course title from course code
  */
 export const generateCourseTitle = (item: TimetableItem): string => {
   const course = item.course || '';
   if (!course) return 'Course Title Not Available';
-  
-  const courseMatch = course.match(/([A-Z]+)\s*(\d+)/);
+
+  // Titles depend only on the course code, and sections repeat codes
+  const cached = courseTitleCache.get(course);
+  if (cached !== undefined) return cached;
+
+  const title = courseTitleFor(course);
+  if (courseTitleCache.size >= COURSE_TITLE_CACHE_LIMIT) courseTitleCache.clear();
+  courseTitleCache.set(course, title);
+  return title;
+};
+
+const courseTitleFor = (course: string): string => {
+  const courseMatch = course.match(COURSE_CODE_PATTERN);
   if (courseMatch) {
     const dept = courseMatch[1];
     const num = courseMatch[2];
@@ -225,25 +272,11 @@ export const generateTimeFallback = (item: TimetableItem): string => {
  * Generate room fallback based on course patterns
  */
 export const generateRoomFallback = (item: TimetableItem): string => {
-  const course = item.course || '';
-  const courseTitle = item.course_title || '';
-  const combinedText = course + ' ' + courseTitle;
-  
   // Check if we can extract room from any raw data
-  const rawText = (item as any).full_text || (item as any).raw_cells?.join(' ') || '';
+  const rawText = rawTextOf(item);
   if (rawText) {
     // Look for room patterns in raw text
-    const roomPatterns = [
-      /\b(Lab\s+\d+)\b/i,          // Lab 02, Lab 05
-      /\b(Digital\s+Lab)\b/i,      // Digital Lab
-      /\b(Computer\s+Lab)\b/i,     // Computer Lab
-      /\b(\d{3})\b/,               // Room numbers like 302
-      /\b(NB-\d+|OB-\d+)\b/i,     // Building codes
-      /\b(TBD)\b/i,                // TBD rooms (treat as online)
-      /\b(Lab\s+\w+)\b/i           // Other lab variations
-    ];
-    
-    for (const pattern of roomPatterns) {
+    for (const pattern of ROOM_FALLBACK_PATTERNS) {
       const match = rawText.match(pattern);
       if (match) {
         const room = match[1];
@@ -253,6 +286,17 @@ export const generateRoomFallback = (item: TimetableItem): string => {
     }
   }
   
+  return roomFallbackFromCourse(item);
+};
+
+/**
+ * Room fallback from the course code/title alone, without looking at raw data
+ */
+const roomFallbackFromCourse = (item: TimetableItem): string => {
+  const course = item.course || '';
+  const courseTitle = item.course_title || '';
+  const combinedText = course + ' ' + courseTitle;
+  
   // Check online pattern
   if (PATTERN_CORRECTIONS.ONLINE_COURSE_PATTERNS.titlePattern.test(combinedText)) {
     return PATTERN_CORRECTIONS.ONLINE_COURSE_PATTERNS.defaultRoom;
@@ -270,11 +314,11 @@ export const generateRoomFallback = (item: TimetableItem): string => {
  * Generate campus fallback based on semester/program patterns
  */
 export const generateCampusFallback = (item: TimetableItem): string => {
-  const semester = item.semester || item.class_section || '';
+  const semester = (item.semester || item.class_section || '').toUpperCase();
   
   // Check for program patterns
-  for (const [pattern, campus] of Object.entries(PATTERN_CORRECTIONS.CAMPUS_PATTERNS)) {
-    if (semester.toUpperCase().includes(pattern)) {
+  for (const [pattern, campus] of CAMPUS_PATTERN_ENTRIES) {
+    if (semester.includes(pattern)) {
       return campus;
     }
   }